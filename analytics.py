@@ -0,0 +1,57 @@
+"""
+Exact odds for a turn decision.
+
+The front of the next card is one of the three colours on its back, each with a 1/3 chance
+(or, with the physical deck, the chances a DeckTracker works out from the cards seen so far).
+Targeting a player succeeds if their tank has any card of the front's colour, so the odds of every target
+can be worked out exactly from the Info a Brain is given. Brains can call it every turn: it only depends on
+mantis_logic. tests/test_benchmarks.py compares its cost with QuantityBrain's heuristic.
+"""
+
+import mantis_logic
+
+FRONT_CHANCE = 1 / mantis_logic.NUM_OF_POSSIBLE_COLOURS_PER_CARD
+
+
+def get_target_odds(info, front_distribution=None) -> dict:
+    """
+    Returns the odds of targeting each player with the next card.
+    front_distribution is the chance of each of the next card's possible colours being its front
+    (see DeckTracker.get_front_distribution()). By default each has a 1/3 chance.
+
+    - Keys: player names (str), in the order of info.player_names.
+    - Values: a dict with
+        - "success_probability": the chance that the card matches the target's tank.
+        - "expected_cards_gained": the expected number of cards moved to your score pile (if the target is you)
+                                   or to your tank (if you're stealing).
+        - "expected_cards_denied": the expected number of cards taken out of the target's tank
+                                   (0 if the target is you).
+    Example:
+    {
+        "Player 1": {"success_probability": 0.333, "expected_cards_gained": 0.667, "expected_cards_denied": 0.0},
+        "Player 2": {"success_probability": 0.667, "expected_cards_gained": 1.667, "expected_cards_denied": 1.0},
+    }
+    """
+    possible_colours = info.next_card_possible_colours
+    if front_distribution is None:
+        front_distribution = dict.fromkeys(possible_colours, FRONT_CHANCE)
+    active_player_name = info.active_player.name
+    colour_counts = info.colour_counts
+    odds = {}
+    for player_name in info.player_names:
+        counts = colour_counts[player_name]
+        success_probability = 0.0
+        expected_cards_denied = 0.0
+        for colour, chance in front_distribution.items():
+            count = counts[colour]
+            if count:
+                success_probability += chance
+                expected_cards_denied += count * chance
+        odds[player_name] = {
+            "success_probability": success_probability,
+            # The drawn card moves along with the matching cards
+            "expected_cards_gained": expected_cards_denied + success_probability,
+            "expected_cards_denied": 0.0 if player_name == active_player_name else expected_cards_denied,
+        }
+    return odds
+
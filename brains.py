@@ -1,20 +1,63 @@
-class RandomBrain:
-    import random
+import mantis_logic
+from deck_tracker import DeckTracker
 
+HOOKS = ("on_game_start", "on_turn_result", "on_game_end")
+
+
+class Brain:
+    """
+    The base class for Brains. A Brain chooses who the active player targets each turn.
+
+    Each player gets its own instance of its Brain (a class passed to Mantis.Player is instantiated),
+    and a tournament reuses one instance per seat for all of its games, so a Brain can keep caches,
+    opponent models and precomputed tables between turns and games.
+
+    Subclasses must implement run(), and can override any of the hooks. The game only calls the hooks a
+    Brain overrides (see hooks), so Brains that don't use them cost nothing extra.
+    """
+
+    # The names of the hooks this class overrides. Set automatically for every subclass.
+    hooks = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.hooks = tuple(hook for hook in HOOKS if getattr(cls, hook) is not getattr(Brain, hook))
+
+    def run(self, info) -> str:
+        """Returns the name of the player to target, given the active player's Info."""
+        raise NotImplementedError
+
+    def on_game_start(self, player_name: str, game_setup: dict):
+        """Called once the cards are dealt, with the name of the player this Brain plays for
+        and the game's public setup (see Mantis.get_game_setup())."""
+
+    def on_turn_result(self, result: dict):
+        """Called after every player's turn, with the result that Player.take_turn() returned."""
+
+    def on_game_end(self, winner_name):
+        """Called once the game is over, with the winner's name (None if the tie-breaking rules couldn't pick one)."""
+
+
+def get_brain_name(brain) -> str:
+    """Returns the class name of a Brain class or instance."""
+    return brain.__name__ if isinstance(brain, type) else type(brain).__name__
+
+
+class RandomBrain(Brain):
     def run(self, info):
         """Chooses a random player to target."""
         num_of_players = len(info.player_names)
-        target_index = self.random.randint(0, num_of_players - 1)
+        target_index = info.rng.randint(0, num_of_players - 1)
         return info.player_names[target_index]
 
 
-class ScorerBrain:
+class ScorerBrain(Brain):
     def run(self, info):
         """Always tries to score for itself."""
         return info.active_player.name
 
 
-class BlueShellBrain:
+class BlueShellBrain(Brain):
     def run(self, info):
         """Chooses the player with the highest score"""
         highest_score = -1
@@ -26,13 +69,13 @@ class BlueShellBrain:
         return best_target
 
 
-class QuantityBrain:
+class QuantityBrain(Brain):
     def run(self, info):
         """Chooses the player with the most cards in their tank."""
         highest_quantity_of_matches = -1
         highest_quantity_players = []
         for player in info.player_names:
-            quantity_of_matches = len(info.tank_colours[player])
+            quantity_of_matches = info.tank_sizes[player]
             if quantity_of_matches > highest_quantity_of_matches:
                 highest_quantity_of_matches = quantity_of_matches
                 highest_quantity_players = [player]
@@ -42,7 +85,7 @@ class QuantityBrain:
             return info.player_names[0]
         return highest_quantity_players[0]
 
-class KleptoBrain:
+class KleptoBrain(Brain):
     def run(self, info):
         """Steals from the first player (effectively a random player) that isn't itself.
         Cannot win (because it never scores)."""
@@ -50,7 +93,40 @@ class KleptoBrain:
             if player_name != info.active_player.name:
                 return player_name
 
-class ManualBrain:
+class CardCountingBrain(Brain):
+    """Chooses the target with the biggest expected haul of the next card, using a DeckTracker's odds of its front.
+    Cards won by scoring count double, because they're safe in the score pile."""
+
+    def __init__(self):
+        self.tracker = DeckTracker()
+
+    def on_game_start(self, player_name, game_setup):
+        self.tracker.on_game_start(game_setup)
+
+    def on_turn_result(self, result):
+        self.tracker.on_turn_result(result)
+
+    def run(self, info):
+        front_distribution = self.tracker.get_front_distribution(info.next_card_possible_colours)
+        active_player_name = info.active_player.name
+        best_target = active_player_name
+        best_haul = -1.0
+        for player_name in info.player_names:
+            counts = info.colour_counts[player_name]
+            haul = 0.0
+            for colour, chance in front_distribution.items():
+                count = counts[colour]
+                if count:
+                    haul += chance * (count + 1)
+            if player_name == active_player_name:
+                haul *= 2
+            if haul > best_haul:
+                best_haul = haul
+                best_target = player_name
+        return best_target
+
+
+class ManualBrain(Brain):
     def run(self, info):
         """A brain that queries the player for input via input()"""
         print(f"Your turn, {info.active_player.name}!")
@@ -70,3 +146,100 @@ class ManualBrain:
                 return target_player
             else:
                 print(f"Invalid target: '{target_player}'. Try again.")
+
+
+class SearchBrain(Brain):
+    """Tries every target against each of the next card's three possible colours, and plays out the
+    rest of each future with fast Monte-Carlo rollouts (every player greedily targeting the biggest
+    expected haul, counting its own score double). Picks the target with the best average outcome.
+
+    Stops once node_budget turns have been simulated, but always plays at least one rollout for every target
+    and colour. time_budget (seconds per decision) adds an optional time limit too, but it makes games depend on
+    the machine's speed, so seeded tournaments are only reproducible without it.
+    Subclass it to change the budgets. Its randomness comes from info.rng."""
+    import time
+
+    rollout_turns = 2
+    node_budget = 2000
+    time_budget = None  # Seconds per decision, or None for no time limit
+
+    def run(self, info):
+        if not info.next_card_possible_colours:
+            return info.active_player.name
+        sandbox = mantis_logic.Mantis.from_info(info, info.rng)
+        fronts = sandbox.deck[-1].back
+        num_of_players = len(sandbox.players)
+
+        totals = [0.0] * num_of_players
+        nodes = 0
+        start_time = self.time.perf_counter()
+        while True:
+            for target_seat in range(num_of_players):
+                for front in fronts:
+                    value, turns_simulated = self.rollout(sandbox, target_seat, front, info.rng)
+                    totals[target_seat] += value
+                    nodes += turns_simulated
+            if nodes >= self.node_budget:
+                break
+            if self.time_budget is not None and self.time.perf_counter() - start_time >= self.time_budget:
+                break
+
+        best_seat = max(range(num_of_players), key=lambda seat: totals[seat])
+        return sandbox.players[best_seat].name
+
+    def rollout(self, sandbox, target_seat: int, front: int, rng):
+        """Plays a move in the sandbox with the given front on the next card, then plays out rollout_turns
+        more turns, then undoes them all. Returns the evaluation for seat 0 and the number of turns simulated."""
+        # Only the cards the rollout can draw are resampled, and they're put back afterwards
+        deck = sandbox.deck
+        depth = min(self.rollout_turns + 1, len(deck))
+        top_cards = deck[-depth:]
+        next_card = mantis_logic.Mantis.Card(auto_generate=False)
+        next_card.back = top_cards[-1].back
+        next_card.front = front
+        deck[-depth:] = rng.choices(mantis_logic.PHYSICAL_DECK, k=depth - 1) + [next_card]
+
+        moves = [sandbox.apply_move(target_seat)]
+        for _ in range(self.rollout_turns):
+            if sandbox.is_game_over():
+                break
+            moves.append(sandbox.apply_move(self.greedy_target(sandbox).seat))
+        value = self.evaluate(sandbox)
+
+        for move in reversed(moves):
+            sandbox.undo_move(move)
+        deck[-depth:] = top_cards
+        return value, len(moves)
+
+    @staticmethod
+    def greedy_target(game):
+        """Returns the player whose tank holds the most cards that any colour could win.
+        Cards won by scoring count double, because they're safe in the score pile."""
+        active_player = game.players[game.turns % len(game.players)]
+        best_target = active_player
+        best_haul = -1
+        for player in game.players:
+            haul = 0
+            for colour_count in player.tank.colour_counts().values():
+                if colour_count:
+                    haul += colour_count + 1
+            if player is active_player:
+                haul *= 2
+            if haul > best_haul:
+                best_haul = haul
+                best_target = player
+        return best_target
+
+    @staticmethod
+    def evaluate(game) -> float:
+        """Scores the game for seat 0: 1 for a win, -1 for a loss, otherwise the lead (score first, then tank)
+        over the best opponent as a fraction of the goal."""
+        me = game.players[0]
+        best_opponent_score = max(len(player.score_pile) for player in game.players[1:])
+        best_opponent_tank = max(len(player.tank) for player in game.players[1:])
+        if len(me.score_pile) >= game.goal:
+            return 1.0
+        if best_opponent_score >= game.goal:
+            return -1.0
+        lead = len(me.score_pile) - best_opponent_score + 0.25 * (len(me.tank) - best_opponent_tank)
+        return max(-1.0, min(1.0, lead / game.goal))
@@ -0,0 +1,79 @@
+"""
+Card counting for Brains.
+
+The physical deck has exactly one card for every back and front pair (see mantis_logic.PHYSICAL_DECK), and every
+card drawn is public: the dealt cards are in Mantis.get_game_setup(), and every turn's result has the drawn card's
+back (card_possible_colours) and front (card_actual_colour). So once a card has been seen, the next card with the same
+back can't have the same front. DeckTracker keeps count of the unseen fronts of every back, and turns them into the
+odds of each front of the next card, instead of the flat 1/3 of each possible colour.
+
+When cards are drawn independently (the default, Mantis.physical_deck = False), seen cards say nothing about the next
+one, and the odds stay flat.
+
+A Brain subscribes by forwarding its hooks to a tracker:
+    def on_game_start(self, player_name, game_setup):
+        self.tracker.on_game_start(game_setup)
+
+    def on_turn_result(self, result):
+        self.tracker.on_turn_result(result)
+"""
+
+from mantis_logic import CARD_BACKS, NUM_OF_POSSIBLE_COLOURS_PER_CARD
+from utils import COLOUR_INDICES, COLOUR_NAMES
+
+FLAT_CHANCE = 1 / NUM_OF_POSSIBLE_COLOURS_PER_CARD
+
+
+class DeckTracker:
+    """
+    Counts the unseen cards of the deck. Each update is O(1), so Brains never need to rescan the history.
+
+    - physical_deck: whether the deck has one card of every back and front pair (see Mantis.physical_deck).
+    - unseen: for every back (a tuple of colour indices), a dict of the number of unseen cards of each front.
+    - cards_seen: the number of cards seen since the game started.
+    """
+
+    def __init__(self, physical_deck=True):
+        self.physical_deck = physical_deck
+        self.reset()
+
+    def reset(self):
+        self.unseen = {back: dict.fromkeys(back, 1) for back in CARD_BACKS}
+        self.cards_seen = 0
+
+    def on_game_start(self, game_setup: dict):
+        """Starts counting a new game from its setup (see Mantis.get_game_setup())."""
+        self.physical_deck = game_setup["physical_deck"]
+        self.reset()
+        for possible_colours, colour in game_setup["dealt_cards"]:
+            self.observe(possible_colours, colour)
+
+    def on_turn_result(self, result: dict):
+        """Counts the card drawn on a turn (see Player.take_turn())."""
+        self.observe(result["card_possible_colours"], result["card_actual_colour"])
+
+    def observe(self, possible_colours: list, colour: str):
+        """Counts one seen card, by its colour names."""
+        self.cards_seen += 1
+        if not self.physical_deck:
+            return
+        back = tuple(sorted(COLOUR_INDICES[possible_colour] for possible_colour in possible_colours))
+        fronts = self.unseen[back]
+        front = COLOUR_INDICES[colour]
+        if fronts[front] > 0:
+            fronts[front] -= 1
+
+    def get_front_distribution(self, possible_colours: list) -> dict:
+        """
+        Returns the odds of each front of a card with the given back, given the cards seen so far.
+        Example: {"red": 0.5, "orange": 0.0, "yellow": 0.5}
+        """
+        if not possible_colours:
+            return {}
+        if self.physical_deck:
+            back = tuple(sorted(COLOUR_INDICES[possible_colour] for possible_colour in possible_colours))
+            fronts = self.unseen[back]
+            unseen = sum(fronts.values())
+            if unseen:
+                return {COLOUR_NAMES[front]: count / unseen for front, count in fronts.items()}
+        return {possible_colour: FLAT_CHANCE for possible_colour in possible_colours}
@@ -0,0 +1,135 @@
+"""
+A vectorized, gym-style environment for reinforcement learning.
+
+MantisVectorEnv steps num_envs games together. In each game, the agent plays one seat and Brains from brains.py play
+the others, inside step(). Observations are neural.encode_info() encodings of the agent's Info, batched into one
+(num_envs, STATE_SIZE) array.
+
+An action is the target's slot in the agent's turn order (Info.turn_order): 0 targets the agent itself (scoring),
+1 the next player, and so on, which is the same order as the observation's seats.
+action_masks() says which slots are taken. Rewards are 1 for a win, -1 for a loss and 0 otherwise, given when
+a game ends. Finished games are reset automatically, and the final observation of the finished game is put in
+that environment's info dict. Requires NumPy.
+
+Example:
+    env = MantisVectorEnv(64, [QuantityBrain, ScorerBrain], seed=1)
+    observations = env.reset()
+    while training:
+        observations, rewards, dones, infos = env.step(policy(observations, env.action_masks()))
+"""
+
+import numpy as np
+
+from brains import Brain
+from mantis_logic import MAX_PLAYERS, MIN_PLAYERS
+from neural import STATE_SIZE, encode_info, encode_infos
+from tournament import derive_game_seed, setup_game
+
+
+class AgentBrain(Brain):
+    """Holds the agent's seat. The agent's moves come from MantisVectorEnv.step(), not from run()."""
+
+    def run(self, info):
+        raise RuntimeError("The agent's moves are chosen by MantisVectorEnv.step()")
+
+
+class MantisVectorEnv:
+    """
+    num_envs games between an agent and the given opponent Brains.
+
+    - agent_seat: the agent's seat in every game, or None to rotate it every episode
+                  (the first player has an advantage, so this evens it out).
+    - seed: every episode's game is seeded from this and the episode's index, so runs are reproducible.
+    """
+
+    def __init__(self, num_envs: int, opponents: list, agent_seat=None, seed=0, physical_deck=False):
+        num_of_players = len(opponents) + 1
+        assert MIN_PLAYERS <= num_of_players <= MAX_PLAYERS
+        assert agent_seat is None or 0 <= agent_seat < num_of_players
+        self.num_envs = num_envs
+        self.num_of_players = num_of_players
+        self.agent_seat = agent_seat
+        self.seed = seed
+        self.physical_deck = physical_deck
+        # Each environment keeps its own opponent instances, so they stay warm between episodes
+        self.opponents = [[brain() if isinstance(brain, type) else brain for brain in opponents] for _ in range(num_envs)]
+        self.agent_brain = AgentBrain()
+        self.episodes = 0
+        self.games = [None] * num_envs
+        self.agents = [None] * num_envs
+        self.infos = [None] * num_envs
+
+    def start_episode(self, env_index: int):
+        """Starts a new game in an environment and plays the opponents' turns up to the agent's first turn."""
+        while True:
+            episode = self.episodes
+            self.episodes += 1
+            agent_seat = episode % self.num_of_players if self.agent_seat is None else self.agent_seat
+            lineup = list(self.opponents[env_index])
+            lineup.insert(agent_seat, self.agent_brain)
+            game = setup_game(lineup, derive_game_seed(self.seed, episode), self.physical_deck)
+            agent = game.players[agent_seat]
+            self.play_opponents(game, agent)
+            if not game.is_game_over():
+                break  # Almost impossible, but the opponents could end the game before the agent plays
+        self.games[env_index] = game
+        self.agents[env_index] = agent
+        self.infos[env_index] = game.get_info(shuffle=True)
+
+    @staticmethod
+    def play_opponents(game, agent):
+        while not game.is_game_over() and game.players[game.turns % len(game.players)] is not agent:
+            game.simulate_turn(return_result=False)
+
+    def reset(self):
+        """Starts a new game in every environment. Returns the observations."""
+        for env_index in range(self.num_envs):
+            self.start_episode(env_index)
+        return encode_infos(self.infos)
+
+    def action_masks(self):
+        """A (num_envs, MAX_PLAYERS) bool array of the actions that target a player."""
+        masks = np.zeros((self.num_envs, MAX_PLAYERS), dtype=bool)
+        masks[:, : self.num_of_players] = True
+        return masks
+
+    def step(self, actions) -> tuple:
+        """
+        Plays each agent's action, then the opponents' turns until it's the agent's turn again or the game is over.
+        Returns (observations, rewards, dones, infos), where infos is a list of dicts. A finished game's dict has
+        its final_observation, winner_name and turns, and its observation is the first of the next game.
+        Every action is checked before any game is played, so a ValueError leaves every environment untouched.
+        """
+        actions = np.asarray(actions)
+        if actions.shape != (self.num_envs,):
+            raise ValueError(f"Expected {self.num_envs} actions, got shape {actions.shape}")
+        if not np.issubdtype(actions.dtype, np.integer):
+            raise ValueError(f"Actions must be integers, got {actions.dtype}")
+        invalid = (actions < 0) | (actions >= self.num_of_players)
+        if invalid.any():
+            action = actions[np.flatnonzero(invalid)[0]]
+            raise ValueError(f"Invalid action: '{action}' (there are {self.num_of_players} players)")
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        step_infos = [{} for _ in range(self.num_envs)]
+        for env_index, action in enumerate(actions.tolist()):
+            game = self.games[env_index]
+            agent = self.agents[env_index]
+            info = self.infos[env_index]
+            game.play_turn(info.turn_order[action], return_result=False)
+            self.play_opponents(game, agent)
+
+            if game.is_game_over():
+                winner = game.get_winner()
+                if winner is not None:
+                    rewards[env_index] = 1.0 if winner is agent else -1.0
+                dones[env_index] = True
+                step_infos[env_index] = {
+                    "final_observation": encode_info(game.get_info(shuffle=False, active_player=agent)),
+                    "winner_name": None if winner is None else winner.name,
+                    "turns": game.turns,
+                }
+                self.start_episode(env_index)
+            else:
+                self.infos[env_index] = game.get_info(shuffle=True)
+        return encode_infos(self.infos), rewards, dones, step_infos
@@ -0,0 +1,246 @@
+"""
+Sequential A/B evaluation of a Brain.
+
+Instead of playing a fixed number of games, evaluate() plays batches and runs a sequential probability ratio test
+(SPRT) on the candidate's win rate after each one. It stops as soon as the games show either that the candidate wins
+at least p1 of its games (it's better), or that it wins no more than p0 (it isn't), which usually takes a fraction of
+the games a fixed-sample test with the same error rates would need (see SPRT.get_fixed_sample_size()).
+
+evaluate_paired() instead uses common random numbers: the candidate and a baseline Brain play the same pre-generated
+decks, in the same seats, against the same opponents. The luck of the deck partly cancels out of the difference
+between their results, so it's measured with fewer games (see PairedResult.variance_reduction()).
+
+Example:
+    result = evaluate(SearchBrain, [QuantityBrain], seed=1)
+    print(result.decision, result.games, result.games_saved)
+
+    paired = evaluate_paired(SearchBrain, QuantityBrain, [ScorerBrain], n_decks=500, seed=1)
+    print(paired.mean_difference(), paired.standard_error(), paired.variance_reduction())
+"""
+
+import math
+from statistics import NormalDist
+
+from league import get_win_rate_interval
+from tournament import derive_game_seed, make_deck, play_game, run_tournament, setup_game
+
+BETTER = "better"
+NOT_BETTER = "not better"
+INCONCLUSIVE = "inconclusive"
+
+
+class SPRT:
+    """
+    Wald's sequential probability ratio test for a win rate, between H0: p = p0 and H1: p = p1.
+    p0 and p1 are shares of all games, so every game that isn't a win (including a draw) counts as a loss.
+
+    - alpha: the chance of deciding BETTER when H0 is true.
+    - beta: the chance of deciding NOT_BETTER when H1 is true.
+    """
+
+    def __init__(self, p0: float, p1: float, alpha=0.05, beta=0.05):
+        assert 0 < p0 < p1 < 1
+        self.p0 = p0
+        self.p1 = p1
+        self.alpha = alpha
+        self.beta = beta
+        self.win_llr = math.log(p1 / p0)
+        self.loss_llr = math.log((1 - p1) / (1 - p0))
+        self.upper_bound = math.log((1 - beta) / alpha)
+        self.lower_bound = math.log(beta / (1 - alpha))
+
+    def get_llr(self, wins: int, losses: int) -> float:
+        """The log likelihood ratio of H1 against H0."""
+        return wins * self.win_llr + losses * self.loss_llr
+
+    def get_fixed_sample_size(self) -> int:
+        """
+        The number of games a one-sided fixed-sample test of the win rate needs for the same alpha and beta
+        (by the normal approximation), which is what the SPRT's games are compared against.
+        """
+        z_alpha = NormalDist().inv_cdf(1 - self.alpha)
+        z_beta = NormalDist().inv_cdf(1 - self.beta)
+        spread = z_alpha * math.sqrt(self.p0 * (1 - self.p0)) + z_beta * math.sqrt(self.p1 * (1 - self.p1))
+        return math.ceil((spread / (self.p1 - self.p0)) ** 2)
+
+    def get_decision(self, wins: int, losses: int) -> str:
+        llr = self.get_llr(wins, losses)
+        if llr >= self.upper_bound:
+            return BETTER
+        if llr <= self.lower_bound:
+            return NOT_BETTER
+        return INCONCLUSIVE
+
+
+class EvaluationResult:
+    """
+    The outcome of evaluate().
+
+    - decision: BETTER, NOT_BETTER, or INCONCLUSIVE (if max_games ran out first).
+    - games, wins, draws: the candidate's record over every game played.
+    - llr: the final log likelihood ratio.
+    - max_games: the most games the evaluation was allowed.
+    - fixed_games: the games a fixed-sample test with the same p0, p1, alpha and beta needs.
+    - games_saved: fixed_games - games, which is negative if the SPRT happened to need more.
+    """
+
+    def __init__(self, decision: str, games: int, wins: int, draws: int, llr: float, max_games: int, fixed_games: int):
+        self.decision = decision
+        self.games = games
+        self.wins = wins
+        self.draws = draws
+        self.llr = llr
+        self.max_games = max_games
+        self.fixed_games = fixed_games
+        self.games_saved = fixed_games - games
+
+    def win_rate(self) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.wins / self.games
+
+    def win_rate_interval(self) -> tuple:
+        return get_win_rate_interval(self.wins, self.games)
+
+    def as_dict(self) -> dict:
+        return {
+            "decision": self.decision,
+            "games": self.games,
+            "wins": self.wins,
+            "draws": self.draws,
+            "llr": self.llr,
+            "max_games": self.max_games,
+            "fixed_games": self.fixed_games,
+            "games_saved": self.games_saved,
+        }
+
+
+def evaluate(
+    candidate,
+    opponents: list,
+    p0=None,
+    p1=None,
+    alpha=0.05,
+    beta=0.05,
+    batch_size=50,
+    max_games=20000,
+    seed=0,
+    workers=1,
+    physical_deck=False,
+) -> EvaluationResult:
+    """
+    Plays the candidate Brain against the opponents in batches until the SPRT decides.
+
+    Each batch plays batch_size games in every seat rotation, so the first player's advantage cancels out.
+    p0 defaults to a fair share of the wins (1 / number of seats), and p1 to 5 percentage points more.
+    """
+    lineup = [candidate] + list(opponents)
+    num_of_seats = len(lineup)
+    if p0 is None:
+        p0 = 1 / num_of_seats
+    if p1 is None:
+        p1 = p0 + 0.05
+    test = SPRT(p0, p1, alpha, beta)
+
+    games = wins = draws = 0
+    decision = INCONCLUSIVE
+    batch = 0
+    while games < max_games:
+        for rotation in range(num_of_seats):
+            rotated_lineup = lineup[rotation:] + lineup[:rotation]
+            results = run_tournament(
+                rotated_lineup,
+                batch_size,
+                derive_game_seed(seed, batch * num_of_seats + rotation),
+                workers,
+                physical_deck,
+            )
+            games += results.games
+            wins += results.wins[(num_of_seats - rotation) % num_of_seats]
+            draws += results.draws
+        batch += 1
+        decision = test.get_decision(wins, games - wins)
+        if decision != INCONCLUSIVE:
+            break
+    return EvaluationResult(
+        decision, games, wins, draws, test.get_llr(wins, games - wins), max_games, test.get_fixed_sample_size()
+    )
+
+
+class PairedResult:
+    """
+    The outcome of evaluate_paired(). Each pair is one deck and seat rotation, played once with the candidate
+    and once with the baseline in the same seat. A result is 1 for a win and 0 otherwise.
+
+    - candidate_results, baseline_results: the result of every pair, in the same order.
+    """
+
+    def __init__(self, candidate_results: list, baseline_results: list):
+        self.candidate_results = candidate_results
+        self.baseline_results = baseline_results
+        self.pairs = len(candidate_results)
+
+    def mean_difference(self) -> float:
+        """The candidate's win rate minus the baseline's."""
+        if self.pairs == 0:
+            return 0.0
+        return (sum(self.candidate_results) - sum(self.baseline_results)) / self.pairs
+
+    def paired_variance(self) -> float:
+        differences = [a - b for a, b in zip(self.candidate_results, self.baseline_results)]
+        return get_variance(differences)
+
+    def unpaired_variance(self) -> float:
+        """The variance of the difference if the candidate and baseline had played independent decks."""
+        return get_variance(self.candidate_results) + get_variance(self.baseline_results)
+
+    def standard_error(self) -> float:
+        if self.pairs == 0:
+            return math.inf
+        return math.sqrt(self.paired_variance() / self.pairs)
+
+    def variance_reduction(self) -> float:
+        """How many times fewer games pairing needs than independent games for the same standard error."""
+        paired_variance = self.paired_variance()
+        if paired_variance == 0:
+            return math.inf
+        return self.unpaired_variance() / paired_variance
+
+    def as_dict(self) -> dict:
+        return {
+            "pairs": self.pairs,
+            "mean_difference": self.mean_difference(),
+            "standard_error": self.standard_error(),
+            "variance_reduction": self.variance_reduction(),
+        }
+
+
+def get_variance(values: list) -> float:
+    """The sample variance of a list of numbers (0 for fewer than 2)."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return sum((value - mean) ** 2 for value in values) / (n - 1)
+
+
+def evaluate_paired(candidate, baseline, opponents: list, n_decks: int, seed=0, physical_deck=False) -> PairedResult:
+    """
+    Plays the candidate and the baseline against the opponents on the same n_decks decks.
+    Every deck is played in every seat rotation, and both games of a pair give the Brains the same seeded randomness
+    (Info.rng), so the only difference between the two games of a pair is the Brain being evaluated.
+    """
+    num_of_seats = len(opponents) + 1
+    candidate_results = []
+    baseline_results = []
+    for deck_index in range(n_decks):
+        game_seed = derive_game_seed(seed, deck_index)
+        deck = make_deck(game_seed, physical_deck)
+        for rotation in range(num_of_seats):
+            seat = (num_of_seats - rotation) % num_of_seats
+            for brain, results in ((candidate, candidate_results), (baseline, baseline_results)):
+                lineup = [brain] + list(opponents)
+                lineup = lineup[rotation:] + lineup[:rotation]
+                game = play_game(setup_game(lineup, game_seed, physical_deck, deck))
+                results.append(1 if game.get_winner() is game.players[seat] else 0)
+    return PairedResult(candidate_results, baseline_results)
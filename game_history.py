@@ -0,0 +1,215 @@
+"""
+Compact binary game histories.
+
+Each turn is packed into 4 bytes (TURN_RECORD): the active player's seat, the target's seat,
+the colour index of the drawn card with the outcome in the top bit, and the number of cards moved.
+
+A history file is a header (MAGIC, then the player names, physical_deck and goal as a JSON object) followed by one
+record per game: the game's seed and number of turns (GAME_HEADER), then its turn records. The header has everything
+besides the seed that's needed to rebuild a game's deck, so replays don't depend on the caller's flags.
+HistoryWriter streams games into a file, and HistoryReader memory-maps one back for analysis.
+"""
+
+import json
+import mmap
+import os
+import struct
+
+from utils import COLOUR_INDICES, COLOUR_NAMES
+
+TURN_RECORD = struct.Struct("<BBBB")
+GAME_HEADER = struct.Struct("<QH")
+HEADER_LENGTH = struct.Struct("<I")
+MAGIC = b"MANTISH1"
+SUCCESS_BIT = 0x80
+
+
+class GameHistory:
+    """
+    The turns of one game, packed into TURN_RECORDs.
+    Indexing or iterating gives the same per-turn dicts that Player.take_turn() returns,
+    except for card_possible_colours (the back of the drawn card), which isn't stored.
+
+    - players: the game's players (or just their names), indexed by seat.
+    - records: the packed turns (a bytearray, or any buffer when reading a file).
+    """
+
+    def __init__(self, players: list, records=None):
+        self.players = players
+        self.records = bytearray() if records is None else records
+        self._seats = {}
+
+    def append(self, result: dict):
+        """Packs a turn result (as returned by Player.take_turn()) onto the end of the history."""
+        self.append_turn(
+            self.get_seat(result["active_player"]),
+            self.get_seat(result["target"]),
+            COLOUR_INDICES[result["card_actual_colour"]],
+            result["cards_moved"],
+            result["outcome"] == "success",
+        )
+
+    def append_turn(self, active_seat: int, target_seat: int, colour_index: int, cards_moved: int, success: bool):
+        colour_byte = colour_index | SUCCESS_BIT if success else colour_index
+        self.records += TURN_RECORD.pack(active_seat, target_seat, colour_byte, cards_moved)
+
+    def pop(self):
+        """Removes the last turn."""
+        del self.records[-TURN_RECORD.size :]
+
+    def get_seat(self, name: str) -> int:
+        seat = self._seats.get(name)
+        if seat is None:
+            self._seats = {self.get_name(seat): seat for seat in range(len(self.players))}
+            seat = self._seats[name]
+        return seat
+
+    def get_name(self, seat: int) -> str:
+        player = self.players[seat]
+        return player if isinstance(player, str) else player.name
+
+    def get_turn(self, turn_index: int) -> tuple:
+        """Returns the (active_seat, target_seat, colour_index, cards_moved, success) of a turn."""
+        active_seat, target_seat, colour_byte, cards_moved = TURN_RECORD.unpack_from(
+            self.records, turn_index * TURN_RECORD.size
+        )
+        return active_seat, target_seat, colour_byte & ~SUCCESS_BIT, cards_moved, bool(colour_byte & SUCCESS_BIT)
+
+    def get_target_seats(self) -> list:
+        return [self.records[i + 1] for i in range(0, len(self.records), TURN_RECORD.size)]
+
+    def __len__(self):
+        return len(self.records) // TURN_RECORD.size
+
+    def __getitem__(self, turn_index: int) -> dict:
+        num_of_turns = len(self)
+        if turn_index < 0:
+            turn_index += num_of_turns
+        if not 0 <= turn_index < num_of_turns:
+            raise IndexError("GameHistory index out of range")
+        active_seat, target_seat, colour_index, cards_moved, success = self.get_turn(turn_index)
+        return {
+            "card_actual_colour": COLOUR_NAMES[colour_index],
+            "cards_moved": cards_moved,
+            "outcome": "success" if success else "fail",
+            "action": "score" if active_seat == target_seat else "steal",
+            "active_player": self.get_name(active_seat),
+            "target": self.get_name(target_seat),
+        }
+
+    def __iter__(self):
+        for turn_index in range(len(self)):
+            yield self[turn_index]
+
+
+class HistoryWriter:
+    """
+    Streams game histories into a binary file object (opened with 'wb' or 'ab').
+    All games in one file have the same player names, physical_deck and goal (see Mantis). Set write_header=False
+    when appending to an existing file, or when the output will be joined onto another writer's with write_raw().
+    """
+
+    def __init__(self, file, player_names: list, physical_deck: bool, goal: int, write_header=True):
+        self.file = file
+        self.player_names = list(player_names)
+        self.physical_deck = physical_deck
+        self.goal = goal
+        self.games = 0
+        if write_header:
+            header = {"player_names": self.player_names, "physical_deck": physical_deck, "goal": goal}
+            header = json.dumps(header).encode()
+            file.write(MAGIC + HEADER_LENGTH.pack(len(header)) + header)
+
+    def write_game(self, game, seed=0):
+        """Appends a game's history. seed should be the seed the game's rng was created with, for replays."""
+        history = game.history
+        self.file.write(GAME_HEADER.pack(seed, len(history)))
+        self.file.write(history.records)
+        self.games += 1
+
+    def write_raw(self, data: bytes, games: int):
+        """Appends game records that were written by another (headerless) HistoryWriter."""
+        self.file.write(data)
+        self.games += games
+
+
+class HistoryRecord:
+    """One game read back from a history file."""
+
+    def __init__(self, seed: int, history: GameHistory):
+        self.seed = seed
+        self.history = history
+
+
+class HistoryReader:
+    """
+    Memory-maps a history file written by HistoryWriter. Games are read lazily, and
+    each GameHistory is a view into the map, so nothing is copied until a turn is decoded.
+    player_names, physical_deck and goal come from the header.
+
+    Example:
+        with HistoryReader("games.bin") as reader:
+            for record in reader:
+                print(record.seed, len(record.history))
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size < len(MAGIC) + HEADER_LENGTH.size:
+            self._file.close()
+            raise ValueError(f"Not a Mantis history file (missing or short header): '{path}'")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._view[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"Not a Mantis history file: '{path}'")
+        offset = len(MAGIC)
+        (header_length,) = HEADER_LENGTH.unpack_from(self._view, offset)
+        offset += HEADER_LENGTH.size
+        if offset + header_length > len(self._view):
+            self.close()
+            raise ValueError(f"Not a Mantis history file (short header): '{path}'")
+        header = json.loads(bytes(self._view[offset : offset + header_length]))
+        offset += header_length
+        self.player_names = header["player_names"]
+        self.physical_deck = header["physical_deck"]
+        self.goal = header["goal"]
+        self._offsets = []
+        while offset < len(self._view):
+            end = offset + GAME_HEADER.size
+            if end <= len(self._view):
+                _, num_of_turns = GAME_HEADER.unpack_from(self._view, offset)
+                end += num_of_turns * TURN_RECORD.size
+            if end > len(self._view):
+                self.close()
+                raise ValueError(f"Truncated Mantis history file: game {len(self._offsets)} is cut off in '{path}'")
+            self._offsets.append(offset)
+            offset = end
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, game_index: int) -> HistoryRecord:
+        offset = self._offsets[game_index]
+        seed, num_of_turns = GAME_HEADER.unpack_from(self._view, offset)
+        start = offset + GAME_HEADER.size
+        records = self._view[start : start + num_of_turns * TURN_RECORD.size]
+        return HistoryRecord(seed, GameHistory(self.player_names, records))
+
+    def __iter__(self):
+        for game_index in range(len(self)):
+            yield self[game_index]
+
+    def close(self):
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # Histories read from the file still point into the map, which closes once they're freed
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,247 @@
+"""
+Leagues between many Brains.
+
+A league schedules tables of Brains (round-robin or Swiss), plays each table in every seat rotation
+(the first player has an advantage, so every Brain gets every seat equally often), and keeps Elo ratings
+up to date after every batch of games. A table stops early once every Brain's win rate at it is known
+to within the league's precision, so lopsided tables don't use up the whole game budget.
+
+Example:
+    league = League([ScorerBrain, QuantityBrain, KleptoBrain, BlueShellBrain], table_size=2, seed=1)
+    league.run_round_robin()
+    for brain, rating in league.standings():
+        print(get_brain_name(brain), round(rating))
+"""
+
+import hashlib
+import itertools
+import math
+
+from mantis_logic import MIN_PLAYERS, MAX_PLAYERS
+from brains import get_brain_name
+from tournament import run_tournament
+
+DEFAULT_RATING = 1500.0
+ELO_SCALE = 400
+DEFAULT_K_FACTOR = 4.0
+DEFAULT_Z = 1.96  # 95% confidence
+
+
+def get_expected_score(rating: float, opponent_rating: float) -> float:
+    """The Elo expected score (win = 1, draw = 0.5) of a player against an opponent."""
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / ELO_SCALE))
+
+
+def get_win_rate_interval(wins: float, games: int, z=DEFAULT_Z) -> tuple:
+    """Returns the Wilson score interval (low, high) of a win rate. Draws can be counted as half a win."""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    denominator = 1 + z * z / games
+    centre = (p + z * z / (2 * games)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games)) / denominator
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+class TableResults:
+    """
+    Results of the games played at one table, over every seat rotation.
+    Lists are indexed by the Brain's position in brains, not by seat.
+    """
+
+    def __init__(self, brains: tuple):
+        self.brains = brains
+        self.games = 0
+        self.wins = [0] * len(brains)
+        self.draws = 0
+        self.games_per_rotation = [0] * len(brains)
+        self.converged = False
+
+    def win_rate(self, index: int) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.wins[index] / self.games
+
+    def win_rate_interval(self, index: int, z=DEFAULT_Z) -> tuple:
+        return get_win_rate_interval(self.wins[index], self.games, z)
+
+    def as_dict(self) -> dict:
+        return {
+            "brains": [get_brain_name(brain) for brain in self.brains],
+            "games": self.games,
+            "wins": self.wins,
+            "draws": self.draws,
+            "converged": self.converged,
+        }
+
+
+class League:
+    """
+    Rates a pool of Brains against each other.
+
+    - table_size: the number of seats at every table (MIN_PLAYERS to MAX_PLAYERS).
+    - batch_size: the number of games played in each seat rotation before the ratings and stopping rule are updated.
+    - max_games: the most games a table plays (rounded up to whole batches of every rotation).
+    - min_games: the fewest games a table plays before it's allowed to stop early.
+    - precision: a table stops once every Brain's win rate interval there is at most this wide on each side.
+    - k_factor: how far a single game moves the Elo ratings.
+    - workers: passed to tournament.run_tournament() for every batch.
+    """
+
+    def __init__(
+        self,
+        brains: list,
+        table_size=2,
+        seed=0,
+        batch_size=50,
+        max_games=2000,
+        min_games=200,
+        precision=0.05,
+        k_factor=DEFAULT_K_FACTOR,
+        z=DEFAULT_Z,
+        workers=1,
+        physical_deck=False,
+    ):
+        assert MIN_PLAYERS <= table_size <= MAX_PLAYERS
+        assert len(brains) >= table_size
+        assert len(set(brains)) == len(brains), "Every Brain in a league must be different"
+        self.brains = list(brains)
+        self.table_size = table_size
+        self.seed = seed
+        self.batch_size = batch_size
+        self.max_games = max_games
+        self.min_games = min_games
+        self.precision = precision
+        self.k_factor = k_factor
+        self.z = z
+        self.workers = workers
+        self.physical_deck = physical_deck
+        self.ratings = {brain: DEFAULT_RATING for brain in brains}
+        self.games_played = {brain: 0 for brain in brains}
+        self.tables = {}
+        self.rounds_played = 0
+
+    def get_table_seed(self, brains: tuple, batch: int, rotation: int) -> int:
+        """Seeds every batch from the Brains at the table, so results don't depend on the schedule's order."""
+        key = f"{self.seed}:{','.join(get_brain_name(brain) for brain in brains)}:{batch}:{rotation}"
+        return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], "big")
+
+    def update_ratings(self, lineup: list, wins: list, games: int):
+        """
+        Updates the Elo ratings with a batch of games between a lineup (indexed by seat).
+        Each game counts as a result between every pair of seats: the winner beats everyone else,
+        and the rest (or everyone, in a draw) draw with each other.
+        The batch's average result is applied once per game, so the ratings move as if its games
+        had been played one at a time.
+        """
+        if games == 0:
+            return
+        num_of_seats = len(lineup)
+        pair_scores = {}
+        for a, b in itertools.combinations(range(num_of_seats), 2):
+            pair_scores[a, b] = (wins[a] + (games - wins[a] - wins[b]) / 2) / games
+        k = self.k_factor / (num_of_seats - 1)
+        ratings = [self.ratings[brain] for brain in lineup]
+        for _ in range(games):
+            changes = [0.0] * num_of_seats
+            for (a, b), score in pair_scores.items():
+                change = k * (score - get_expected_score(ratings[a], ratings[b]))
+                changes[a] += change
+                changes[b] -= change
+            for seat in range(num_of_seats):
+                ratings[seat] += changes[seat]
+        for seat, brain in enumerate(lineup):
+            self.ratings[brain] = ratings[seat]
+            self.games_played[brain] += games
+
+    def is_converged(self, table: TableResults) -> bool:
+        if table.games < self.min_games:
+            return False
+        for index in range(len(table.brains)):
+            low, high = table.win_rate_interval(index, self.z)
+            if (high - low) / 2 > self.precision:
+                return False
+        return True
+
+    def play_table(self, brains) -> TableResults:
+        """
+        Plays a table until it converges or reaches max_games. Each batch plays batch_size games
+        in every rotation of the seats. Playing a table again continues where it stopped.
+        """
+        brains = tuple(brains)
+        table = self.tables.get(brains)
+        if table is None:
+            table = self.tables[brains] = TableResults(brains)
+        num_of_brains = len(brains)
+        while not table.converged and table.games < self.max_games:
+            batch = table.games // (self.batch_size * num_of_brains)
+            for rotation in range(num_of_brains):
+                lineup = list(brains[rotation:] + brains[:rotation])
+                results = run_tournament(
+                    lineup,
+                    self.batch_size,
+                    self.get_table_seed(brains, batch, rotation),
+                    self.workers,
+                    self.physical_deck,
+                )
+                self.update_ratings(lineup, results.wins, results.games)
+                for seat in range(num_of_brains):
+                    index = (seat + rotation) % num_of_brains
+                    table.wins[index] += results.wins[seat]
+                table.games_per_rotation[rotation] += results.games
+                table.games += results.games
+                table.draws += results.draws
+            table.converged = self.is_converged(table)
+        return table
+
+    def run_round_robin(self):
+        """Plays every combination of table_size Brains."""
+        for brains in itertools.combinations(self.brains, self.table_size):
+            self.play_table(brains)
+        self.rounds_played += 1
+        return self
+
+    def get_swiss_tables(self) -> list:
+        """
+        Groups the Brains into tables of similarly rated Brains, best first. Each Brain is seated with the
+        next best Brains it hasn't finished a table with yet, if there are enough of them.
+        Leftover Brains form a smaller table if there are at least MIN_PLAYERS of them, or sit the round out.
+        """
+        order = sorted(self.brains, key=lambda brain: -self.ratings[brain])
+        tables = []
+        while len(order) >= MIN_PLAYERS:
+            size = min(self.table_size, len(order))
+            first = order[0]
+            fresh = [brain for brain in order[1:] if not self.has_finished_table(first, brain)]
+            table = [first] + fresh[: size - 1]
+            if len(table) < size:
+                table += [brain for brain in order[1:] if brain not in table][: size - len(table)]
+            tables.append(tuple(sorted(table, key=self.brains.index)))
+            order = [brain for brain in order if brain not in table]
+        return tables
+
+    def has_finished_table(self, brain, other_brain) -> bool:
+        for brains, table in self.tables.items():
+            if brain in brains and other_brain in brains and (table.converged or table.games >= self.max_games):
+                return True
+        return False
+
+    def run_swiss(self, rounds: int):
+        """Plays rounds of Swiss tables, re-pairing the Brains by rating after each round."""
+        for _ in range(rounds):
+            for brains in self.get_swiss_tables():
+                self.play_table(brains)
+            self.rounds_played += 1
+        return self
+
+    def standings(self) -> list:
+        """Returns (brain, rating) pairs, best first."""
+        return sorted(self.ratings.items(), key=lambda item: -item[1])
+
+    def as_dict(self) -> dict:
+        return {
+            "ratings": {get_brain_name(brain): rating for brain, rating in self.standings()},
+            "games_played": {get_brain_name(brain): games for brain, games in self.games_played.items()},
+            "tables": [table.as_dict() for table in self.tables.values()],
+            "rounds_played": self.rounds_played,
+        }
@@ -40,11 +40,16 @@ On your turn, choose ONE of these two actions:
 - If tied on Score Pile size, player with most cards in Tank wins
 """
 
+import itertools
 import random
+from functools import cached_property
+from time import perf_counter
 
 from utils import *
+from game_history import GameHistory
 
 NUM_OF_COLOURS = len(COLOUR_DICT)
+COLOUR_INDEX_RANGE = range(1, NUM_OF_COLOURS + 1)
 NUM_OF_POSSIBLE_COLOURS_PER_CARD = 3
 DECK_SIZE = 105
 STARTING_TANK_SIZE = 4
@@ -52,24 +57,44 @@ DEFAULT_GOAL = 10
 MIN_PLAYERS = 2
 MAX_PLAYERS = 6
 
+# Every possible card back: C(7,3) = 35 sorted tuples of colour indices, shared by every card with that back.
+CARD_BACKS = tuple(itertools.combinations(COLOUR_INDEX_RANGE, NUM_OF_POSSIBLE_COLOURS_PER_CARD))
+
 
 class Mantis:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # All of the game's randomness comes from self.rng. It defaults to the global random module, but
+        # passing in a random.Random instance makes the game reproducible and independent of other games.
+        self.rng = rng if rng is not None else random
+        # The randomness Brains should use (see Info.rng). Kept apart from rng, so Brains can't change the deck.
+        # tournament.setup_game() gives every seeded game its own random.Random.
+        self.brain_rng = random
         self.players = []
         self.deck = []
         self.goal = DEFAULT_GOAL
+        # If True, the deck is the 105-card physical deck (every back with each of its 3 fronts) shuffled.
+        # If False, every card is drawn independently (which gives each card the same odds).
+        self.physical_deck = False
         self.turns = 0
-        self.history = []
+        self.history = GameHistory(self.players)
+        # The player returned by get_highest_score_player(). Every score pile tells the game when it changes
+        # (see CardPile.on_change), so this stays up to date however the pile is changed.
+        self.score_leader = None
+        # Set to a profiling.Profiler to time every turn by phase (see profiling.py).
+        self.profiler = None
+        # The Brains that override each hook (see brains.Brain), collected by start_game().
+        self.turn_result_brains = []
+        self.game_end_brains = []
 
     def draw_card(self):
         """Returns and pops (REMOVES) the top card from the deck."""
         return self.deck.pop()
 
     def generate_card(self, possible_colours, random_colour=True):
-        card = self.Card()
+        card = self.Card(auto_generate=False)
         card.possible_colours = possible_colours
         if random_colour:
-            card.assign_random_colour()
+            card.assign_random_colour(self.rng)
         else:
             card.colour = possible_colours[0]
         return card
@@ -78,10 +103,45 @@ class Mantis:
         number_of_players = len(self.players)
         return MIN_PLAYERS <= number_of_players <= MAX_PLAYERS
 
-    def start_game(self):
+    def start_game(self, deck=None):
+        """Shuffles the deck and deals the cards. If a deck is given (a list of Cards, top card last), it's played
+        instead of a new one. Cards are never modified, so one deck can be shared between any number of games."""
         assert self.is_valid_num_of_players()
-        self.shuffle_deck()
+        if deck is None:
+            self.shuffle_deck()
+        else:
+            assert len(deck) >= len(self.players) * STARTING_TANK_SIZE
+            self.deck = list(deck)
         self.deal_cards()
+        self.turn_result_brains = []
+        self.game_end_brains = []
+        game_setup = None
+        for player in self.players:
+            hooks = getattr(player.brain, "hooks", ())
+            if "on_turn_result" in hooks:
+                self.turn_result_brains.append(player.brain)
+            if "on_game_end" in hooks:
+                self.game_end_brains.append(player.brain)
+            if "on_game_start" in hooks:
+                if game_setup is None:
+                    game_setup = self.get_game_setup()
+                player.brain.on_game_start(player.name, game_setup)
+
+    def get_game_setup(self) -> dict:
+        """
+        Returns the public facts about a game that's just been dealt, for Brain.on_game_start().
+
+        - player_names: the names of the players, in turn order.
+        - goal: the score pile size that wins the game.
+        - physical_deck: whether the deck is the shuffled physical deck (see self.physical_deck).
+        - dealt_cards: the (possible_colours, colour) of every card dealt into the tanks, in deal order.
+        """
+        return {
+            "player_names": [player.name for player in self.players],
+            "goal": self.goal,
+            "physical_deck": self.physical_deck,
+            "dealt_cards": [(card.possible_colours, card.colour) for player in self.players for card in player.tank],
+        }
 
     def deal_cards(self):
         for player in self.players:
@@ -91,9 +151,13 @@ class Mantis:
             player.tank = new_tank
 
     def shuffle_deck(self):
-        new_deck = []
-        for i in range(DECK_SIZE):
-            new_deck.append(self.Card())
+        """Builds the deck from the prebuilt cards in PHYSICAL_DECK, which are shared between games and frozen.
+        Drawing a card from PHYSICAL_DECK is the same as drawing a random back and then a random front from it."""
+        if self.physical_deck:
+            new_deck = list(PHYSICAL_DECK)
+            self.rng.shuffle(new_deck)
+        else:
+            new_deck = self.rng.choices(PHYSICAL_DECK, k=DECK_SIZE)
         self.deck = new_deck
 
     def is_valid_new_name(self, input_name:str) -> bool:
@@ -112,29 +176,114 @@ class Mantis:
                 return True
         return False
 
-    def simulate_turn(self):
+    def simulate_turn(self, return_result=True):
+        """Asks the active player's Brain for a target and plays the turn. Returns the result (see play_turn())."""
         current_player = self.players[self.turns % len(self.players)]
-        result = current_player.take_turn()
+        return self.play_turn(current_player.choose_target(), return_result)
+
+    def play_turn(self, target_name: str, return_result=True):
+        """
+        Plays and records the active player's turn against the named target.
+        Returns the result dict (see Player.resolve_turn()), or None if return_result is False. The dict is only
+        built if it's returned or a Brain has on_turn_result(), so the hot path never converts colours to names.
+        """
+        player = self.players[self.turns % len(self.players)]
+        target = player.get_target(target_name)
+        card, cards_moved, success = player.play(target)
+        return self.record_play(player, target, card, cards_moved, success, return_result)
+
+    def record_play(self, player, target, card, cards_moved: int, success: bool, return_result=True):
+        """Records a turn played by Player.play(). The history is packed straight from the seats and colour index."""
+        profiler = self.profiler
+        if profiler is not None:
+            start = perf_counter()
+        self.history.append_turn(player.seat, target.seat, card.front, cards_moved, success)
+        result = None
+        if return_result or self.turn_result_brains:
+            result = player.get_result(target, card, cards_moved, success)
+        self.end_turn(result)
+        if profiler is not None:
+            profiler.add_turn(perf_counter() - start)
+        return result
+
+    def record_turn(self, result: dict):
+        """Adds a turn played by Player.resolve_turn() to the history, and ends the turn."""
+        profiler = self.profiler
+        if profiler is not None:
+            start = perf_counter()
         self.history.append(result)
+        self.end_turn(result)
+        if profiler is not None:
+            profiler.add_turn(perf_counter() - start)
+
+    def end_turn(self, result: dict):
+        """Moves on to the next turn and tells the Brains about the result (and about the end of the game)."""
         self.turns += 1
-        return result
+        for brain in self.turn_result_brains:
+            brain.on_turn_result(result)
+        if self.game_end_brains and self.is_game_over():
+            winner = self.get_winner()
+            winner_name = None if winner is None else winner.name
+            for brain in self.game_end_brains:
+                brain.on_game_end(winner_name)
+            self.game_end_brains = []
 
     def get_highest_score_player(self):
-        """Returns the player with the highest score"""
+        """Returns the player with the highest score (the first one in turn order if tied)"""
+        return self.score_leader
+
+    def refresh_score_leader(self):
+        """Recomputes score_leader from scratch."""
         winner = None
         highest_score = -1
         for player in self.players:
             if len(player.score_pile) > highest_score:
                 highest_score = len(player.score_pile)
                 winner = player
+        self.score_leader = winner
+
+    def update_score_leader(self, player):
+        """Updates score_leader after the given player's score went up."""
+        leader = self.score_leader
+        if leader is None:
+            self.score_leader = player
+            return
+        score = len(player.score_pile)
+        leader_score = len(leader.score_pile)
+        if score > leader_score or (score == leader_score and player.seat < leader.seat):
+            self.score_leader = player
+
+    def get_winner(self):
+        """Returns the winning player using the tie-breaking rules (score, then tank size).
+        Returns None if the top players are tied on both."""
+        winner = None
+        best_key = None
+        tied = False
+        for player in self.players:
+            key = (len(player.score_pile), len(player.tank))
+            if best_key is None or key > best_key:
+                winner = player
+                best_key = key
+                tied = False
+            elif key == best_key:
+                tied = True
+        if tied:
+            return None
         return winner
 
+    def is_goal_reached(self) -> bool:
+        leader = self.score_leader
+        return leader is not None and len(leader.score_pile) >= self.goal
+
+    def is_game_over(self) -> bool:
+        """Same check as game_over_message(), without building the message."""
+        return self.is_goal_reached() or len(self.deck) == 0
+
     def game_over_message(self) -> str:
-        for player in self.players:
-            if len(player.score_pile) >= self.goal:
-                winner = self.get_highest_score_player()
-                winner_score = len(winner.score_pile)
-                return f"{winner.name} won with a score of {winner_score}!"
+        if self.is_goal_reached():
+            winner = self.get_highest_score_player()
+            winner_score = len(winner.score_pile)
+            return f"{winner.name} won with a score of {winner_score}!"
         if len(self.deck) == 0:
             return "Ran out of cards"
         return ""  # If the game isn't over, we return a Falsy string
@@ -194,8 +343,119 @@ class Mantis:
         print()
 
 
-    def get_info(self, shuffle=True):
-        return self.Info(self, shuffle)
+    def get_info(self, shuffle=True, active_player=None):
+        """Returns the Info for the active player, or for the given player's seat (like after the game is over)."""
+        return self.Info(self, shuffle, active_player)
+
+    def apply_move(self, target_seat: int):
+        """
+        Plays a turn for the active player against the player in target_seat, without asking a Brain or
+        recording history. Returns a Move that undo_move() can use to restore the game exactly.
+        Follows the same rules as Player.score_action() and Player.steal_action().
+        """
+        active_player = self.players[self.turns % len(self.players)]
+        target = self.players[target_seat]
+        card = self.draw_card()
+        colour_index = card.front
+        source = target.tank
+        destination = active_player.score_pile if target is active_player else active_player.tank
+
+        move = self.Move()
+        move.card = card
+        move.active_seat = active_player.seat
+        move.target_seat = target_seat
+        move.source_next_position = source.next_position
+        move.destination_next_position = destination.next_position
+        move.previous_score_leader = self.score_leader
+
+        source.append(card)
+        if source.count_colour_index(colour_index) > 1:
+            move.positions, moved_cards = source.take_colour_index(colour_index)
+            destination.extend(moved_cards)
+            move.cards = moved_cards
+            move.cards_moved = len(moved_cards)
+        else:
+            move.positions = None
+            move.cards = None
+            move.cards_moved = 1
+        self.turns += 1
+        return move
+
+    def undo_move(self, move):
+        """Restores the game to how it was before apply_move() returned the given Move.
+        Moves must be undone in the reverse order they were applied."""
+        self.turns -= 1
+        active_player = self.players[move.active_seat]
+        target = self.players[move.target_seat]
+        colour_index = move.card.front
+        if move.positions is None:
+            target.tank.pop_newest(colour_index, 1, move.source_next_position)
+        else:
+            destination = active_player.score_pile if target is active_player else active_player.tank
+            destination.pop_newest(colour_index, move.cards_moved, move.destination_next_position)
+            target.tank.restore_colour_index(colour_index, move.positions, move.cards)
+            target.tank.pop_newest(colour_index, 1, move.source_next_position)  # The drawn card
+        self.score_leader = move.previous_score_leader
+        self.deck.append(move.card)
+
+    class Move:
+        """The change made by Mantis.apply_move(), with everything undo_move() needs to reverse it."""
+        __slots__ = (
+            "card",
+            "active_seat",
+            "target_seat",
+            "cards_moved",
+            "positions",  # The positions the moved cards had in the target's tank, or None if the move failed
+            "cards",  # The moved cards, or None if the move failed
+            "source_next_position",
+            "destination_next_position",
+            "previous_score_leader",
+        )
+
+        @property
+        def success(self) -> bool:
+            return self.positions is not None
+
+    def copy(self):
+        """Returns a copy of the game for Brains to search with. Much faster than copy.deepcopy(), because
+        cards are shared (they're never modified) and only the piles and deck are copied.
+        The copy shares this game's rng and starts with an empty history."""
+        game = Mantis(self.rng)
+        game.players.extend(player.copy(game) for player in self.players)
+        game.deck = self.deck.copy()
+        game.goal = self.goal
+        game.physical_deck = self.physical_deck
+        game.brain_rng = self.brain_rng
+        game.turns = self.turns
+        if self.score_leader is not None:
+            game.score_leader = game.players[self.score_leader.seat]
+        return game
+
+    @classmethod
+    def from_info(cls, info, rng=None):
+        """
+        Builds a game that matches the public information in an Info, for Brains to search with.
+        - The active player is in seat 0 and it's their turn. The rest follow in turn order (info.turn_order).
+        - Tanks have the same colours, and score piles have the same sizes.
+        - The deck has info.cards_left cards. The top card has the real back; every front is a random guess.
+        """
+        game = cls(rng)
+        game.goal = info.goal
+        for name in info.turn_order:
+            player = cls.Player.__new__(cls.Player)
+            player.game = game
+            player.name = name
+            player.seat = len(game.players)
+            player.brain = None
+            game.players.append(player)
+            player.tank = [COLOUR_CARDS[COLOUR_INDICES[colour]] for colour in info.tank_colours[name]]
+            player.score_pile = [COLOUR_CARDS[1]] * info.scores[name]
+
+        game.deck = game.rng.choices(PHYSICAL_DECK, k=info.cards_left)
+        next_card_possible_colours = info.next_card_possible_colours
+        if game.deck and next_card_possible_colours:
+            game.deck[-1] = game.generate_card(next_card_possible_colours)
+        return game
 
     class Info:
         """
@@ -225,58 +485,163 @@ class Mantis:
                         "Player 3": 7
                     }
 
+        - tank_sizes: a dict where keys are player names and values are the number of cards in their tank.
+                    Cheaper than len(tank_colours[name]), because it doesn't build the colour lists.
+
+        - colour_counts: a dict where keys are player names and values are dicts of the number of cards
+                    of each colour in their tank.
+                    Example:
+                    {
+                        "Player 1": {"red": 1, "orange": 0, "yellow": 0, "green": 1, "blue": 0, "purple": 0, "pink": 0},
+                        ...
+                    }
+
         - next_card_possible_colours: a list of the possible colours of the next card in the deck.
                     Example: ["red", "orange", "yellow"]
+        - cards_left: the number of cards left in the draw pile.
+        - goal: the score pile size that wins the game.
         - active_player: the player whose turn it is next/currently.
+        - turn_order: the player names in turn order, starting with the active player. Never shuffled, so
+                    turn_order.index(name) is how many turns after the active player that player plays.
+                    Example: ["Player 2", "Player 3", "Player 1"]
+        - rng: the random source Brains should use instead of the random module. Seeded games give each game its
+                    own, so they're reproducible without reseeding the random module.
+
+        An Info describes the game at the turn it was made for. The per-player fields are read from the game the
+        first time they're used, so reading one after a turn has been played raises a RuntimeError, instead of
+        mixing two turns' states. Use them during run() (or before the game moves on).
         """
 
-        def __init__(self, parent_game, shuffle=True):
+        def __init__(self, parent_game, shuffle=True, active_player=None):
             # self.game = parent_game  # For security reasons, we don't expose the game object.
-            input_player_names = parent_game.players.copy()
-            if shuffle:
-                random.shuffle(input_player_names)
-
-            self.player_names = []
-            self.tank_colours = {}
-            self.scores = {}
-
-            for player in input_player_names:
-                self.player_names.append(player.name)
-                self.tank_colours[player.name] = player.get_self_tank_colours()
-                self.scores[player.name] = len(player.score_pile)
-
+            # Everything except active_player is computed the first time a Brain reads it, so Brains only pay for
+            # what they use. Only public state is kept: the players and the back (not the front) of the next card.
+            self._players = parent_game.players
+            self._shuffle = parent_game.rng.shuffle if shuffle else None
             if len(parent_game.deck) > 0:
-                self.next_card_possible_colours = parent_game.deck[-1].possible_colours
+                self._next_card_back = parent_game.deck[-1].back
             else:
-                self.next_card_possible_colours = []
-
-            self.active_player = parent_game.players[
-                parent_game.turns % len(parent_game.players)
-            ]  # It's important that this is NOT shuffled
+                self._next_card_back = ()
+            self.cards_left = len(parent_game.deck)
+            self.goal = parent_game.goal
+            self.rng = parent_game.brain_rng
+            self._turn = parent_game.turns
+
+            if active_player is None:
+                active_player = parent_game.players[parent_game.turns % len(parent_game.players)]
+            self.active_player = active_player  # It's important that this is NOT shuffled
+
+        def _check_turn(self):
+            if self.active_player.game.turns != self._turn:
+                raise RuntimeError(f"This Info is for turn {self._turn}, but the game has moved on")
+
+        @cached_property
+        def _ordered_players(self) -> list:
+            input_players = self._players.copy()
+            if self._shuffle is not None:
+                self._shuffle(input_players)
+            return input_players
+
+        @cached_property
+        def player_names(self) -> list:
+            return [player.name for player in self._ordered_players]
+
+        @cached_property
+        def tank_colours(self) -> dict:
+            self._check_turn()
+            return {player.name: player.get_self_tank_colours() for player in self._ordered_players}
+
+        @cached_property
+        def scores(self) -> dict:
+            self._check_turn()
+            return {player.name: len(player.score_pile) for player in self._ordered_players}
+
+        @cached_property
+        def tank_sizes(self) -> dict:
+            self._check_turn()
+            return {player.name: len(player.tank) for player in self._ordered_players}
+
+        @cached_property
+        def colour_counts(self) -> dict:
+            self._check_turn()
+            return {player.name: player.tank.colour_counts() for player in self._ordered_players}
+
+        @cached_property
+        def turn_order(self) -> list:
+            players = self._players
+            active_seat = self.active_player.seat
+            return [player.name for player in players[active_seat:] + players[:active_seat]]
+
+        @cached_property
+        def next_card_possible_colours(self) -> list:
+            return [COLOUR_NAMES[colour_index] for colour_index in self._next_card_back]
 
     class Card:
-        def __init__(self, auto_generate=True):
-            self.possible_colours = []
-            self.colour = ""
-            if auto_generate:
-                self.assign_random_possible_colours()
-                self.assign_random_colour()
+        """
+        A card with a back (its three possible colours) and a front (its actual colour).
+        Colours are stored as indices (see COLOUR_NAMES) in slots, to keep cards small and fast to make.
+        possible_colours and colour convert to and from colour names.
+        """
+        __slots__ = ("back", "front")
 
-        def assign_random_possible_colours(self):
+        def __init__(self, auto_generate=True, rng=random):
+            self.back = ()  # A tuple of colour indices
+            self.front = 0  # A colour index, where 0 is blank
+            if auto_generate:
+                self.assign_random_possible_colours(rng)
+                self.assign_random_colour(rng)
+
+        @property
+        def possible_colours(self) -> list:
+            return [COLOUR_NAMES[colour_index] for colour_index in self.back]
+
+        @possible_colours.setter
+        def possible_colours(self, colour_names: list):
+            self.back = tuple(COLOUR_INDICES[colour_name] for colour_name in colour_names)
+
+        @property
+        def colour(self) -> str:
+            return COLOUR_NAMES[self.front]
+
+        @colour.setter
+        def colour(self, colour_name: str):
+            self.front = COLOUR_INDICES[colour_name]
+
+        @property
+        def back_mask(self) -> int:
+            """The back as a 7-bit mask, where bit (colour index - 1) is set for each possible colour."""
+            mask = 0
+            for colour_index in self.back:
+                mask |= 1 << (colour_index - 1)
+            return mask
+
+        @property
+        def code(self) -> int:
+            """The card packed into one int: the back mask, shifted left 3 bits, plus the front's colour index."""
+            return (self.back_mask << 3) | self.front
+
+        @classmethod
+        def from_code(cls, code: int):
+            card = cls(auto_generate=False)
+            mask = code >> 3
+            card.back = tuple(colour_index for colour_index in range(1, NUM_OF_COLOURS + 1) if mask & (1 << (colour_index - 1)))
+            card.front = code & 0b111
+            return card
+
+        def assign_random_possible_colours(self, rng=random):
             """Assigns random possible colours to this card"""
-            self.possible_colours = convert_colour_list_to_names(
-                random.sample(
-                    range(1, NUM_OF_COLOURS + 1), NUM_OF_POSSIBLE_COLOURS_PER_CARD
-                )
-            )
+            self.back = rng.choice(CARD_BACKS)
 
-        def assign_random_colour(self):
+        def assign_random_colour(self, rng=random):
             """Assigns a random colour to this card from its possible colours"""
-            if self.possible_colours:
-                self.colour = random.choice(self.possible_colours)
+            if self.back:
+                self.front = rng.choice(self.back)
             else:
-                self.assign_random_possible_colours()
-                self.assign_random_colour()
+                self.assign_random_possible_colours(rng)
+                self.assign_random_colour(rng)
+
+        def __repr__(self):
+            return f"Card({self.colour!r}, {self.possible_colours!r})"
 
     class Player:
         def __init__(self, parent_game, brain, name):
@@ -285,10 +650,51 @@ class Mantis:
                 self.name = name
             else:
                 raise ValueError(f"Invalid Player Name: '{name}'")
+            self.seat = len(self.game.players)
             self.game.players.append(self)
             self.tank = []
             self.score_pile = []
-            self.brain = brain
+            # A Brain class gets its own instance. An instance is used as is, so it can be reused between games.
+            self.brain = brain() if isinstance(brain, type) else brain
+
+        # The tank and score pile are CardPiles, but can be assigned any list of cards
+        @property
+        def tank(self) -> CardPile:
+            return self._tank
+
+        @tank.setter
+        def tank(self, cards):
+            self._tank = cards if isinstance(cards, CardPile) else CardPile(cards)
+
+        @property
+        def score_pile(self) -> CardPile:
+            return self._score_pile
+
+        @score_pile.setter
+        def score_pile(self, cards):
+            pile = cards if isinstance(cards, CardPile) else CardPile(cards)
+            pile.on_change = self.on_score_pile_change
+            self._score_pile = pile
+            self.game.refresh_score_leader()
+
+        def on_score_pile_change(self, grew: bool):
+            """Keeps the game's score leader up to date. Growing only needs this player compared with the leader."""
+            if grew:
+                self.game.update_score_leader(self)
+            else:
+                self.game.refresh_score_leader()
+
+        def copy(self, game):
+            """Returns a copy of this player for the given copy of the game (see Mantis.copy())."""
+            player = Mantis.Player.__new__(Mantis.Player)
+            player.game = game
+            player.name = self.name
+            player.seat = self.seat
+            player.brain = self.brain
+            player._tank = self._tank.copy()
+            player._score_pile = self._score_pile.copy()
+            player._score_pile.on_change = player.on_score_pile_change
+            return player
 
         def get_self_tank_colours(self):
             return get_tank_colours(self)
@@ -300,15 +706,32 @@ class Mantis:
             return None
 
         def take_turn(self):
+            return self.resolve_turn(self.choose_target())
+
+        def choose_target(self) -> str:
+            """Asks this player's Brain for the name of its target, timing it if the game has a profiler."""
+            profiler = self.game.profiler
+            if profiler is None:
+                return self.brain.run(self.game.get_info(shuffle=True))
+            start = perf_counter()
             info = self.game.get_info(shuffle=True)
-            target_name = self.brain.run(self.brain, info).lower()
+            info_done = perf_counter()
+            target_name = self.brain.run(info)
+            profiler.add("get_info", info_done - start)
+            profiler.add_decision(type(self.brain).__name__, perf_counter() - info_done)
+            return target_name
+
+        def get_target(self, target_name: str):
+            """Returns the player with the given name (in any case), or raises a ValueError."""
+            target_name = target_name.lower()
             target = self.get_player_object_from_name(target_name)
             if target is None:
                 raise ValueError(f"Invalid target name: '{target_name}'")
-            result = self.action(target)
-            result["active_player"] = self.name
-            result["target"] = target.name
-            return result
+            return target
+
+        def resolve_turn(self, target_name: str) -> dict:
+            """Plays the turn against the target the Brain chose, and returns the result."""
+            return self.action(self.get_target(target_name))
 
         def action(self, target) -> dict:
             if target.name == self.name:
@@ -316,47 +739,87 @@ class Mantis:
             else:
                 return self.steal_action(target)
 
-        def steal_action(self, target) -> dict:
+        def play(self, target) -> tuple:
+            """
+            Plays a score (if target is this player) or a steal against target, without building a result.
+            Returns the drawn card, the number of cards moved and whether it succeeded.
+            """
+            profiler = self.game.profiler
+            if profiler is not None:
+                start = perf_counter()
             card = self.game.draw_card()
-            if get_matching_colours_of_player(target, card.colour):
-                target.tank.append(card)
-                cards_moved = move_colours_from_tank(target, card.colour, self.tank)
-                outcome = "success"
+            source = target.tank
+            source.append(card)
+            if profiler is not None:
+                scan_start = perf_counter()
+            if source.count_colour_index(card.front) > 1:
+                destination = self.score_pile if target is self else self.tank
+                cards_moved = move_colours_from_tank(target, card.front, destination)
+                success = True
             else:
-                target.tank.append(card)
                 cards_moved = 1
-                outcome = "fail"
-
-            result = {
+                success = False
+            if profiler is not None:
+                profiler.add("score_action" if target is self else "steal_action", scan_start - start)
+                profiler.add("helpers", perf_counter() - scan_start)
+            return card, cards_moved, success
+
+        def get_result(self, target, card, cards_moved: int, success: bool) -> dict:
+            """Builds the result dict of a turn played by play()."""
+            return {
                 "card_actual_colour": card.colour,
+                "card_possible_colours": card.possible_colours,
                 "cards_moved": cards_moved,
-                "outcome": outcome,
-                "action": "steal"
+                "outcome": "success" if success else "fail",
+                "action": "score" if target is self else "steal",
+                "active_player": self.name,
+                "target": target.name,
             }
-            return result
 
-        def score_action(self) -> dict:
-            card = self.game.draw_card()
-            if self.get_self_matching_colours(card.colour):
-                self.tank.append(card)
-                cards_moved = self.move_colours_from_self_tank(card.colour, self.score_pile)
-                outcome = "success"
-            else:
-                self.tank.append(card)
-                cards_moved = 1
-                outcome =  "fail"
+        def steal_action(self, target) -> dict:
+            return self.get_result(target, *self.play(target))
 
-            result = {
-                "card_actual_colour": card.colour,
-                "cards_moved": cards_moved,
-                "outcome": outcome,
-                "action": "score"
-            }
-            return result
+        def score_action(self) -> dict:
+            return self.get_result(self, *self.play(self))
 
 
-        def move_colours_from_self_tank(self, colour: str, target: list) -> int:
+        def move_colours_from_self_tank(self, colour, target: list) -> int:
             return move_colours_from_tank(self, colour, target)
 
-        def get_self_matching_colours(self, colour: str) -> list:
+        def get_self_matching_colours(self, colour) -> list:
             return get_matching_colours_of_player(self, colour)
+
+
+class FrozenCard(Mantis.Card):
+    """
+    A Card that can't be changed after it's made. PHYSICAL_DECK's cards are shared by every game in the process,
+    so changing one (even through a setter like colour) would change it in every later game. Raises an
+    AttributeError instead.
+    """
+    __slots__ = ()
+
+    def __init__(self, back: tuple, front: int):
+        object.__setattr__(self, "back", back)
+        object.__setattr__(self, "front", front)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Can't set {name}: the card is shared between games")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Can't delete {name}: the card is shared between games")
+
+    def __reduce__(self):
+        return FrozenCard, (self.back, self.front)
+
+
+def build_physical_deck() -> tuple:
+    """Returns the 105 cards of the physical deck: one card for every back and front pair."""
+    deck = tuple(FrozenCard(back, front) for back in CARD_BACKS for front in back)
+    assert len(deck) == DECK_SIZE
+    return deck
+
+
+PHYSICAL_DECK = build_physical_deck()
+
+# One placeholder card of each colour (by colour index), for piles where only the fronts are known.
+COLOUR_CARDS = (None,) + tuple(FrozenCard((), colour_index) for colour_index in COLOUR_INDEX_RANGE)
@@ -0,0 +1,167 @@
+"""
+Neural network Brains.
+
+encode_info() turns an Info into a fixed-width vector, whatever the number of players:
+- For each of MAX_PLAYERS seats, in turn order starting with the active player (see Info.turn_order):
+  whether the seat is taken, its tank's count of each colour, its score and its tank size (SEAT_FEATURES values).
+  Empty seats are all zeros.
+- The next card's back, as a mask of its possible colours (NUM_OF_COLOURS values).
+- The fraction of the deck left.
+
+NeuralBrain scores every seat with an MLP and targets the best one. Calling a model for one Info at a time is slow,
+so play_games_batched() plays many games in lockstep and gives each NeuralBrain all of its pending decisions at once,
+for a single forward pass per turn. Requires NumPy.
+
+Example:
+    results = play_games_batched([NeuralBrain, QuantityBrain], n_games=1000, seed=1)
+"""
+
+import math
+
+import numpy as np
+
+from brains import Brain
+from mantis_logic import DECK_SIZE, MAX_PLAYERS, NUM_OF_COLOURS
+from tournament import TournamentResults, derive_game_seed, get_player_names, setup_game
+from utils import COLOUR_INDICES
+
+COUNT_SCALE = 10  # Divides card counts, to keep the inputs near 1
+SEAT_FEATURES = 3 + NUM_OF_COLOURS  # Taken, colour counts, score, tank size
+BACK_OFFSET = MAX_PLAYERS * SEAT_FEATURES
+STATE_SIZE = BACK_OFFSET + NUM_OF_COLOURS + 1
+EMPTY_SEAT = [0.0] * SEAT_FEATURES
+
+
+def get_state_values(info) -> list:
+    """Returns the STATE_SIZE values of an Info's encoding (see the module docstring) as a list of floats.
+    Building a list and converting it once is much faster than filling an array one value at a time."""
+    colour_counts = info.colour_counts
+    scores = info.scores
+    goal = info.goal
+    turn_order = info.turn_order
+    values = []
+    for player_name in turn_order:
+        counts = colour_counts[player_name].values()
+        values.append(1.0)
+        values.extend([count / COUNT_SCALE for count in counts])
+        values.append(scores[player_name] / goal)
+        values.append(sum(counts) / COUNT_SCALE)
+    values.extend(EMPTY_SEAT * (MAX_PLAYERS - len(turn_order)))
+    back = [0.0] * NUM_OF_COLOURS
+    for colour in info.next_card_possible_colours:
+        back[COLOUR_INDICES[colour] - 1] = 1.0
+    values.extend(back)
+    values.append(info.cards_left / DECK_SIZE)
+    return values
+
+
+def encode_info(info):
+    """Encodes an Info into a float32 vector of STATE_SIZE values."""
+    return np.array(get_state_values(info), dtype=np.float32)
+
+
+def encode_infos(infos: list):
+    """Encodes a batch of Infos into a (len(infos), STATE_SIZE) array."""
+    if not infos:
+        return np.zeros((0, STATE_SIZE), dtype=np.float32)
+    return np.array([get_state_values(info) for info in infos], dtype=np.float32)
+
+
+class MLP:
+    """
+    A multi-layer perceptron in NumPy, with ReLU hidden layers and a linear output layer.
+    The default maps a state to one score per seat.
+    """
+
+    def __init__(self, layer_sizes=(STATE_SIZE, 64, MAX_PLAYERS), seed=0):
+        rng = np.random.default_rng(seed)
+        self.weights = []
+        self.biases = []
+        for fan_in, fan_out in zip(layer_sizes[:-1], layer_sizes[1:]):
+            # He initialisation, which suits ReLU layers
+            self.weights.append(rng.normal(0, math.sqrt(2 / fan_in), (fan_in, fan_out)).astype(np.float32))
+            self.biases.append(np.zeros(fan_out, dtype=np.float32))
+
+    def forward(self, states):
+        """Returns the output for a (batch, inputs) array of states."""
+        values = states
+        last_layer = len(self.weights) - 1
+        for layer, (weights, biases) in enumerate(zip(self.weights, self.biases)):
+            values = values @ weights + biases
+            if layer < last_layer:
+                np.maximum(values, 0, out=values)
+        return values
+
+    def save(self, path):
+        arrays = {}
+        for layer, (weights, biases) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"weights_{layer}"] = weights
+            arrays[f"biases_{layer}"] = biases
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        model = cls.__new__(cls)
+        with np.load(path) as arrays:
+            num_of_layers = len(arrays.files) // 2
+            model.weights = [arrays[f"weights_{layer}"] for layer in range(num_of_layers)]
+            model.biases = [arrays[f"biases_{layer}"] for layer in range(num_of_layers)]
+        return model
+
+
+def choose_targets(infos: list, seat_scores) -> list:
+    """Returns the name of the best scoring taken seat for each Info, given a (batch, MAX_PLAYERS) array of scores."""
+    seat_scores = np.array(seat_scores, dtype=np.float32)
+    for row, info in enumerate(infos):
+        seat_scores[row, len(info.turn_order) :] = -np.inf
+    best_slots = np.argmax(seat_scores, axis=1)
+    return [info.turn_order[slot] for info, slot in zip(infos, best_slots)]
+
+
+class NeuralBrain(Brain):
+    """Targets the seat its model scores highest. Without a model, it uses an untrained MLP."""
+
+    def __init__(self, model=None):
+        self.model = model if model is not None else MLP()
+
+    def run(self, info):
+        return self.run_batch([info])[0]
+
+    def run_batch(self, infos: list) -> list:
+        """Chooses a target for every Info, with one forward pass."""
+        return choose_targets(infos, self.model.forward(encode_infos(infos)))
+
+
+def play_games_batched(brains: list, n_games: int, seed=0, physical_deck=False) -> TournamentResults:
+    """
+    Plays n_games games between the Brains in lockstep, one turn of every unfinished game at a time.
+    Brains with a run_batch() method make all of their decisions for the turn in one call. The others are asked one
+    game at a time, as usual.
+
+    Every seat's Brain is one instance shared by all the games (so a batched Brain sees all their decisions),
+    which means Brains that keep per-game state don't work here.
+    """
+    seat_brains = [brain() if isinstance(brain, type) else brain for brain in brains]
+    results = TournamentResults(get_player_names(brains))
+    games = [setup_game(seat_brains, derive_game_seed(seed, game_index), physical_deck) for game_index in range(n_games)]
+    while games:
+        pending = {}
+        for game in games:
+            player = game.players[game.turns % len(game.players)]
+            if hasattr(player.brain, "run_batch"):
+                pending.setdefault(player.brain, []).append((game, game.get_info(shuffle=True)))
+            else:
+                game.simulate_turn(return_result=False)
+        for brain, decisions in pending.items():
+            target_names = brain.run_batch([info for _, info in decisions])
+            for (game, _), target_name in zip(decisions, target_names):
+                game.play_turn(target_name, return_result=False)
+
+        unfinished_games = []
+        for game in games:
+            if game.is_game_over():
+                results.record_game(game)
+            else:
+                unfinished_games.append(game)
+        games = unfinished_games
+    return results
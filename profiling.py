@@ -0,0 +1,141 @@
+"""
+Opt-in timing of simulated turns.
+
+Setting game.profiler to a Profiler makes every turn (Mantis.simulate_turn() or Player.take_turn()) time its phases:
+- get_info: building the Info (its fields are lazy, so most of their cost shows up in the Brain's decision).
+- decision: the Brain's run(), which is also recorded per Brain as a latency histogram.
+- score_action / steal_action: drawing the card into the target's tank.
+- helpers: the utils.py scans that match the card's colour and move the matching cards.
+- history: recording the turn in the game's history, and calling the Brains' hooks.
+The timing lives in Mantis and Player themselves, behind a profiler check, so when game.profiler is None
+(the default) the only cost is a few attribute checks per turn.
+
+Example:
+    results = run_tournament([SearchBrain, QuantityBrain], n_games=100, seed=1, profile=True)
+    print(results.profiler.report())
+"""
+
+PHASES = ("setup", "get_info", "decision", "score_action", "steal_action", "helpers", "history")
+NUM_OF_BUCKETS = 32
+
+
+def get_bucket(seconds: float) -> int:
+    """Buckets a latency by powers of 2 microseconds: bucket b holds latencies in [2^(b-1), 2^b) µs (0 is < 1 µs)."""
+    return min(int(seconds * 1e6).bit_length(), NUM_OF_BUCKETS - 1)
+
+
+def get_bucket_upper_bound(bucket: int) -> float:
+    """The upper bound of a bucket in seconds."""
+    return (1 << bucket) / 1e6
+
+
+class BrainLatency:
+    """Decision latencies of one Brain: a count, total, maximum, and a histogram (see get_bucket())."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * NUM_OF_BUCKETS
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram[get_bucket(seconds)] += 1
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        for bucket, count in enumerate(other.histogram):
+            self.histogram[bucket] += count
+        return self
+
+    def mean(self) -> float:
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def percentile(self, fraction: float) -> float:
+        """An upper bound on the given percentile (0 to 1), from the histogram."""
+        if self.count == 0:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                return min(get_bucket_upper_bound(bucket), self.max)
+        return self.max
+
+
+class Profiler:
+    """
+    Per-phase counters and timings for every turn played while it's attached to a game.
+    Profilers from different games or processes can be combined with merge().
+
+    - phase_counts, phase_times: the number of times each phase ran, and its total seconds.
+    - brain_latencies: a BrainLatency per Brain class name.
+    """
+
+    def __init__(self):
+        self.turns = 0
+        self.phase_counts = {phase: 0 for phase in PHASES}
+        self.phase_times = {phase: 0.0 for phase in PHASES}
+        self.brain_latencies = {}
+
+    def add(self, phase: str, seconds: float):
+        self.phase_counts[phase] += 1
+        self.phase_times[phase] += seconds
+
+    def add_turn(self, history_seconds: float):
+        """Counts a finished turn, with the time it took to record it."""
+        self.turns += 1
+        self.add("history", history_seconds)
+
+    def add_decision(self, brain_name: str, seconds: float):
+        self.add("decision", seconds)
+        latency = self.brain_latencies.get(brain_name)
+        if latency is None:
+            latency = self.brain_latencies[brain_name] = BrainLatency()
+        latency.add(seconds)
+
+    def merge(self, other):
+        self.turns += other.turns
+        for phase in PHASES:
+            self.phase_counts[phase] += other.phase_counts[phase]
+            self.phase_times[phase] += other.phase_times[phase]
+        for brain_name, latency in other.brain_latencies.items():
+            if brain_name in self.brain_latencies:
+                self.brain_latencies[brain_name].merge(latency)
+            else:
+                self.brain_latencies[brain_name] = BrainLatency().merge(latency)
+        return self
+
+    def total_time(self) -> float:
+        return sum(self.phase_times.values())
+
+    def slowest_brains(self) -> list:
+        """Returns (brain name, BrainLatency) pairs, slowest mean decision first."""
+        return sorted(self.brain_latencies.items(), key=lambda item: -item[1].mean())
+
+    def report(self) -> str:
+        total_time = self.total_time() or 1.0
+        lines = [f"Profiled {self.turns} turns in {self.total_time():.3f} s", "", "Phase          Calls     Total s   Mean µs  Share"]
+        for phase in PHASES:
+            count = self.phase_counts[phase]
+            if count == 0:
+                continue
+            seconds = self.phase_times[phase]
+            lines.append(
+                f"{phase:<13}{count:>7}{seconds:>12.4f}{seconds / count * 1e6:>10.1f}{seconds / total_time:>7.1%}"
+            )
+        lines += ["", "Brain               Decisions   Mean µs    p50 µs    p99 µs    Max µs"]
+        for brain_name, latency in self.slowest_brains():
+            lines.append(
+                f"{brain_name:<20}{latency.count:>9}{latency.mean() * 1e6:>10.1f}{latency.percentile(0.5) * 1e6:>10.1f}"
+                f"{latency.percentile(0.99) * 1e6:>10.1f}{latency.max * 1e6:>10.1f}"
+            )
+        return "\n".join(lines)
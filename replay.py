@@ -0,0 +1,103 @@
+"""
+Replays tournament games from their seed and target choices.
+
+A tournament game's deck only depends on its seed (see tournament.make_game_rng()), so the seed plus the
+target seat of every turn (which a history file already stores) is enough to rebuild the game exactly.
+
+Example:
+    replay = Replay.from_file("games.bin", game_index=12)
+    replay.seek(30)
+    replay.print_info()
+
+Or from the command line:
+    python replay.py games.bin 12 --turn 30
+"""
+
+import argparse
+
+import mantis_logic
+from game_history import HistoryReader
+from tournament import make_game_rng
+
+
+class Replay:
+    """
+    Rebuilds a game from its seed and the target seat chosen on each turn.
+    seek() fast-forwards (or rewinds) to any turn, and game is the rebuilt Mantis at the current turn.
+    """
+
+    def __init__(self, player_names: list, seed: int, target_seats: list, physical_deck=False, goal=mantis_logic.DEFAULT_GOAL):
+        self.target_seats = list(target_seats)
+        rng, _ = make_game_rng(seed)
+        game = mantis_logic.Mantis(rng)
+        for name in player_names:
+            game.Player(game, None, name)
+        game.goal = goal
+        game.physical_deck = physical_deck
+        game.start_game()
+        self.game = game
+        self.moves = []
+
+    @classmethod
+    def from_file(cls, path, game_index: int):
+        """
+        Loads a game from a history file written by a tournament (see tournament.run_tournament()).
+        The deck is rebuilt with the physical_deck and goal in the file's header.
+        """
+        with HistoryReader(path) as reader:
+            record = reader[game_index]
+            return cls(
+                reader.player_names, record.seed, record.history.get_target_seats(), reader.physical_deck, reader.goal
+            )
+
+    def step(self) -> bool:
+        """Plays the next turn. Returns False if there are no more turns."""
+        game = self.game
+        if game.turns >= len(self.target_seats):
+            return False
+        move = game.apply_move(self.target_seats[game.turns])
+        game.history.append_turn(move.active_seat, move.target_seat, move.card.front, move.cards_moved, move.success)
+        self.moves.append(move)
+        return True
+
+    def step_back(self) -> bool:
+        """Undoes the last turn. Returns False if there are no turns to undo."""
+        if not self.moves:
+            return False
+        self.game.undo_move(self.moves.pop())
+        self.game.history.pop()
+        return True
+
+    def seek(self, turn: int):
+        """Fast-forwards or rewinds to the given turn (the number of turns played). Returns the game."""
+        turn = max(0, min(turn, len(self.target_seats)))
+        while self.game.turns < turn:
+            self.step()
+        while self.game.turns > turn:
+            self.step_back()
+        return self.game
+
+    def print_info(self):
+        self.game.print_info()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a game from a Mantis tournament history file.")
+    parser.add_argument("path", help="the history file")
+    parser.add_argument("game_index", type=int, help="which game in the file to replay")
+    parser.add_argument("--turn", type=int, help="only show the game at this turn")
+    args = parser.parse_args()
+
+    replay = Replay.from_file(args.path, args.game_index)
+    if args.turn is not None:
+        replay.seek(args.turn)
+        replay.print_info()
+        return
+    replay.print_info()
+    while replay.step():
+        replay.print_info()
+    print(replay.game.game_over_message())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Columnar export of tournament results, for analysing millions of games in NumPy or pandas.
+
+ResultsWriter buffers one row per game and one row per turn, and every batch_size games writes them out as a pair
+of shard files in a directory: games-*.npz and turns-*.npz (or .parquet, if pyarrow is installed).
+Every column is 1-D, so a loaded table goes straight into pandas.DataFrame().
+
+Game columns:
+- game_index, seed: the game's index in the tournament and its seed (see tournament.derive_game_seed()).
+- turns: the number of turns played.
+- winner_seat: the winner under the tie-breaking rules (score, then tank size), or -1 for a draw.
+- highest_score_seat: Mantis.get_highest_score_player()'s seat (the first seat on a tied score).
+- goal_reached: whether the game ended by a player reaching the goal, rather than by running out of cards.
+- score_0, score_1, ...: each seat's final score pile size.
+- tank_size_0, tank_size_1, ...: each seat's final tank size.
+
+Turn columns:
+- game_index, turn, active_seat, target_seat, colour_index, cards_moved, success.
+
+Each shard also stores the lineup: brain_names and player_names, indexed by seat.
+"""
+
+import json
+import os
+from array import array
+from glob import glob
+
+import numpy as np
+
+from brains import get_brain_name
+from game_history import TURN_RECORD, SUCCESS_BIT
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+FORMATS = ("npz", "parquet")
+DEFAULT_BATCH_SIZE = 100_000
+
+
+class ResultsWriter:
+    """
+    Buffers per-game and per-turn results in columns and writes them out in batches.
+
+    - directory: where to write the shards (created if needed).
+    - brains, player_names: the lineup, indexed by seat.
+    - name: the prefix of this writer's shard files. Writers sharing a directory need different names,
+            and load_games()/load_turns() read shards in order of their file names.
+    """
+
+    def __init__(self, directory, brains: list, player_names: list, name="results", batch_size=DEFAULT_BATCH_SIZE, file_format="npz"):
+        if file_format not in FORMATS:
+            raise ValueError(f"Invalid file_format: '{file_format}'")
+        if file_format == "parquet" and pyarrow is None:
+            raise ImportError("Writing parquet files requires pyarrow")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.brain_names = [get_brain_name(brain) for brain in brains]
+        self.player_names = list(player_names)
+        self.name = name
+        self.batch_size = batch_size
+        self.file_format = file_format
+        self.shards_written = 0
+        self._reset_buffers()
+
+    def _reset_buffers(self):
+        num_of_seats = len(self.player_names)
+        self.game_columns = {
+            "game_index": array("q"),
+            "seed": array("Q"),
+            "turns": array("h"),
+            "winner_seat": array("b"),
+            "highest_score_seat": array("b"),
+            "goal_reached": array("b"),
+        }
+        for seat in range(num_of_seats):
+            self.game_columns[f"score_{seat}"] = array("h")
+        for seat in range(num_of_seats):
+            self.game_columns[f"tank_size_{seat}"] = array("h")
+        self.turn_game_index = array("q")
+        self.turn_records = bytearray()
+        self.buffered_games = 0
+
+    def record_game(self, game, game_index: int, seed=0):
+        """Adds a finished game's results to the buffers, flushing them if the batch is full."""
+        columns = self.game_columns
+        columns["game_index"].append(game_index)
+        columns["seed"].append(seed)
+        columns["turns"].append(game.turns)
+        winner = game.get_winner()
+        columns["winner_seat"].append(-1 if winner is None else winner.seat)
+        columns["highest_score_seat"].append(game.get_highest_score_player().seat)
+        columns["goal_reached"].append(game.is_goal_reached())
+        for player in game.players:
+            columns[f"score_{player.seat}"].append(len(player.score_pile))
+            columns[f"tank_size_{player.seat}"].append(len(player.tank))
+
+        records = game.history.records
+        self.turn_records += records
+        self.turn_game_index.extend([game_index] * (len(records) // TURN_RECORD.size))
+
+        self.buffered_games += 1
+        if self.buffered_games >= self.batch_size:
+            self.flush()
+
+    def get_game_table(self) -> dict:
+        table = {name: np.asarray(column) for name, column in self.game_columns.items()}
+        table["goal_reached"] = table["goal_reached"].astype(bool)
+        return table
+
+    def get_turn_table(self) -> dict:
+        records = np.frombuffer(bytes(self.turn_records), dtype=np.uint8).reshape(-1, TURN_RECORD.size)
+        game_index = np.asarray(self.turn_game_index)
+        # Turns of the same game are consecutive, so a turn's number is its offset from its game's first turn
+        if len(game_index):
+            game_starts = np.flatnonzero(np.r_[True, game_index[1:] != game_index[:-1]])
+            game_lengths = np.diff(np.r_[game_starts, len(game_index)])
+            turn = np.arange(len(game_index)) - np.repeat(game_starts, game_lengths)
+        else:
+            turn = np.zeros(0, dtype=np.int64)
+        return {
+            "game_index": game_index,
+            "turn": turn.astype(np.int16),
+            "active_seat": records[:, 0].astype(np.int8),
+            "target_seat": records[:, 1].astype(np.int8),
+            "colour_index": (records[:, 2] & (SUCCESS_BIT - 1)).astype(np.int8),
+            "cards_moved": records[:, 3].astype(np.int8),
+            "success": (records[:, 2] & SUCCESS_BIT) != 0,
+        }
+
+    def flush(self):
+        """Writes the buffered games as one pair of shard files."""
+        if self.buffered_games == 0:
+            return
+        shard_name = f"{self.name}-{self.shards_written:05d}"
+        self.write_table(f"games-{shard_name}", self.get_game_table())
+        self.write_table(f"turns-{shard_name}", self.get_turn_table())
+        self.shards_written += 1
+        self._reset_buffers()
+
+    def write_table(self, file_name: str, table: dict):
+        path = os.path.join(self.directory, f"{file_name}.{self.file_format}")
+        if self.file_format == "npz":
+            np.savez_compressed(
+                path, brain_names=np.array(self.brain_names), player_names=np.array(self.player_names), **table
+            )
+        else:
+            metadata = {"brain_names": json.dumps(self.brain_names), "player_names": json.dumps(self.player_names)}
+            arrow_table = pyarrow.table(table).replace_schema_metadata(metadata)
+            pyarrow.parquet.write_table(arrow_table, path)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def get_shard_paths(directory, kind: str) -> list:
+    """The paths of every shard of one kind ("games" or "turns") in a directory, in order."""
+    return sorted(glob(os.path.join(directory, f"{kind}-*.npz")) + glob(os.path.join(directory, f"{kind}-*.parquet")))
+
+
+def check_unused(directory):
+    """Raises FileExistsError if a directory already holds shards, which load_table() would mix into a new run's."""
+    if get_shard_paths(directory, "games") or get_shard_paths(directory, "turns"):
+        raise FileExistsError(f"Results directory already has shards from another run: '{directory}'")
+
+
+def load_table(directory, kind: str) -> dict:
+    """Loads and joins every shard of one kind ("games" or "turns") in a directory into a dict of columns."""
+    shards = []
+    for path in get_shard_paths(directory, kind):
+        if path.endswith(".npz"):
+            with np.load(path) as shard:
+                shards.append({name: shard[name] for name in shard.files if name not in ("brain_names", "player_names")})
+        else:
+            if pyarrow is None:
+                raise ImportError("Reading parquet files requires pyarrow")
+            arrow_table = pyarrow.parquet.read_table(path)
+            shards.append({name: arrow_table[name].to_numpy() for name in arrow_table.column_names})
+    if not shards:
+        return {}
+    return {name: np.concatenate([shard[name] for shard in shards]) for name in shards[0]}
+
+
+def load_games(directory) -> dict:
+    return load_table(directory, "games")
+
+
+def load_turns(directory) -> dict:
+    return load_table(directory, "turns")
+
+
+def load_lineup(directory) -> tuple:
+    """Returns the (brain_names, player_names) stored in a directory's shards."""
+    for path in sorted(glob(os.path.join(directory, "games-*.npz"))):
+        with np.load(path) as shard:
+            return shard["brain_names"].tolist(), shard["player_names"].tolist()
+    for path in sorted(glob(os.path.join(directory, "games-*.parquet"))):
+        metadata = pyarrow.parquet.read_schema(path).metadata
+        return json.loads(metadata[b"brain_names"]), json.loads(metadata[b"player_names"])
+    return [], []
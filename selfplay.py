@@ -0,0 +1,198 @@
+"""
+Self-play training data for neural Brains.
+
+generate_dataset() plays games between Brains across worker processes and records every turn as a sample:
+- states: the active player's Info, encoded by neural.encode_info() (float32, STATE_SIZE values).
+- targets: who the Brain targeted, as a slot in Info.turn_order (0 is the active player itself).
+- outcomes: how the game ended for the active player: 1 for a win, -1 for a loss, 0 if nobody won.
+- game_indices: which game of the dataset the sample is from.
+
+Games are grouped into shards of games_per_shard games. Each shard is saved as one .npy file per array, which
+np.load(mmap_mode="r") can read without loading it into memory, and manifest.json lists the finished shards.
+A shard is only added to the manifest once all of its files are written, so an interrupted run can be resumed by
+calling generate_dataset() again with the same arguments (or a bigger n_games, to extend the dataset, which also
+regenerates a last shard that was cut short by the old n_games).
+Requires NumPy.
+
+Example:
+    generate_dataset([QuantityBrain, ScorerBrain, BlueShellBrain], n_games=100000, directory="data", workers=None)
+    for shard in iter_shards("data"):
+        train_on(shard["states"], shard["targets"], shard["outcomes"])
+"""
+
+import json
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from brains import get_brain_name
+from neural import STATE_SIZE, get_state_values
+from tournament import derive_game_seed, get_player_names, setup_game
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+ARRAYS = ("states", "targets", "outcomes", "game_indices")
+
+
+def get_shard_path(directory, shard_index: int, array_name: str) -> str:
+    return os.path.join(directory, f"shard-{shard_index:05d}-{array_name}.npy")
+
+
+def play_sample_game(seat_brains: list, game_seed: int, physical_deck=False) -> tuple:
+    """Plays one game, recording every turn. Returns the game, each turn's state values, target slot and active seat."""
+    game = setup_game(seat_brains, game_seed, physical_deck)
+    states = []
+    targets = []
+    active_seats = []
+    num_of_players = len(game.players)
+    while not game.is_game_over():
+        player = game.players[game.turns % num_of_players]
+        info = game.get_info(shuffle=True)
+        target_name = player.brain.run(info)
+        states.append(get_state_values(info))
+        game.play_turn(target_name, return_result=False)
+        target_seat = game.history.get_turn(game.turns - 1)[1]
+        targets.append((target_seat - player.seat) % num_of_players)
+        active_seats.append(player.seat)
+    return game, states, targets, active_seats
+
+
+def generate_shard(
+    brains: list, directory, shard_index: int, start: int, stop: int, seed: int, physical_deck=False
+) -> dict:
+    """Plays games start..stop-1 and saves their samples as one shard. Returns the shard's manifest entry."""
+    seat_brains = [brain() if isinstance(brain, type) else brain for brain in brains]
+    states = []
+    targets = array("b")
+    outcomes = array("b")
+    game_indices = array("q")
+    for game_index in range(start, stop):
+        game, game_states, game_targets, active_seats = play_sample_game(
+            seat_brains, derive_game_seed(seed, game_index), physical_deck
+        )
+        winner = game.get_winner()
+        states += game_states
+        targets.extend(game_targets)
+        if winner is None:
+            outcomes.extend([0] * len(active_seats))
+        else:
+            outcomes.extend([1 if seat == winner.seat else -1 for seat in active_seats])
+        game_indices.extend([game_index] * len(active_seats))
+
+    arrays = {
+        "states": np.array(states, dtype=np.float32).reshape(-1, STATE_SIZE),
+        "targets": np.asarray(targets, dtype=np.int8),
+        "outcomes": np.asarray(outcomes, dtype=np.int8),
+        "game_indices": np.asarray(game_indices, dtype=np.int64),
+    }
+    for array_name, values in arrays.items():
+        # Written under a temporary name first, so each array file is either complete or missing
+        path = get_shard_path(directory, shard_index, array_name)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.save(file, values)
+        os.replace(temporary_path, path)
+    return {"index": shard_index, "start": start, "stop": stop, "samples": len(game_indices)}
+
+
+def load_manifest(directory) -> dict:
+    """Returns a dataset's manifest, or None if it doesn't have one yet."""
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_manifest(directory, manifest: dict):
+    path = os.path.join(directory, MANIFEST_NAME)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        json.dump(manifest, file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def generate_dataset(
+    brains: list, n_games: int, directory, seed=0, games_per_shard=1000, workers=1, physical_deck=False
+) -> dict:
+    """
+    Generates (or resumes generating) a dataset of n_games self-play games in directory, and returns its manifest.
+    workers is the number of processes to generate shards with (None uses every core).
+    Resuming with different Brains, seed, games_per_shard or physical_deck raises a ValueError,
+    since the shards wouldn't match.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    config = {
+        "version": MANIFEST_VERSION,
+        "brains": [get_brain_name(brain) for brain in brains],
+        "player_names": get_player_names(brains),
+        "seed": seed,
+        "games_per_shard": games_per_shard,
+        "physical_deck": physical_deck,
+        "state_size": STATE_SIZE,
+    }
+    manifest = load_manifest(directory)
+    if manifest is None:
+        manifest = dict(config, n_games=0, shards=[])
+    else:
+        for key, value in config.items():
+            if manifest[key] != value:
+                raise ValueError(f"Can't resume a dataset with a different {key}: '{manifest[key]}' != '{value}'")
+    n_games = manifest["n_games"] = max(manifest["n_games"], n_games)
+
+    # A finished shard is redone if it stopped short, because an earlier, smaller n_games ended inside it
+    finished_stops = {shard["index"]: shard["stop"] for shard in manifest["shards"]}
+    todo = []
+    for shard_index, start in enumerate(range(0, n_games, games_per_shard)):
+        stop = min(start + games_per_shard, n_games)
+        if finished_stops.get(shard_index, start) < stop:
+            todo.append((shard_index, start, stop))
+    # Regenerating a short shard overwrites its files one array at a time, so it's dropped from the manifest first:
+    # if generation stops partway, the manifest never lists a shard whose arrays don't match
+    todo_indices = {shard_index for shard_index, _, _ in todo}
+    manifest["shards"] = [entry for entry in manifest["shards"] if entry["index"] not in todo_indices]
+    save_manifest(directory, manifest)
+
+    def add_shard(shard: dict):
+        manifest["shards"] = [entry for entry in manifest["shards"] if entry["index"] != shard["index"]]
+        manifest["shards"].append(shard)
+        manifest["shards"].sort(key=lambda entry: entry["index"])
+        save_manifest(directory, manifest)
+
+    if workers <= 1 or len(todo) <= 1:
+        for shard_index, start, stop in todo:
+            add_shard(generate_shard(brains, directory, shard_index, start, stop, seed, physical_deck))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(generate_shard, brains, directory, shard_index, start, stop, seed, physical_deck)
+                for shard_index, start, stop in todo
+            ]
+            for future in as_completed(futures):
+                add_shard(future.result())
+    save_manifest(directory, manifest)
+    return manifest
+
+
+def iter_shards(directory, mmap_mode="r"):
+    """Yields each finished shard of a dataset as a dict of arrays, memory-mapped by default."""
+    manifest = load_manifest(directory)
+    if manifest is None:
+        return
+    for shard in manifest["shards"]:
+        yield {
+            array_name: np.load(get_shard_path(directory, shard["index"], array_name), mmap_mode=mmap_mode)
+            for array_name in ARRAYS
+        }
+
+
+def load_dataset(directory) -> dict:
+    """Loads every finished shard of a dataset into memory, joined into one dict of arrays."""
+    shards = list(iter_shards(directory, mmap_mode=None))
+    if not shards:
+        return {}
+    return {array_name: np.concatenate([shard[array_name] for shard in shards]) for array_name in ARRAYS}
@@ -0,0 +1,83 @@
+import pytest
+
+import analytics
+import brains
+import mantis_logic
+import tournament
+
+
+def make_game():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+    p3 = game.Player(game, None, "Player 3")
+    p1.tank = [game.generate_card([colour], random_colour=False) for colour in ["red", "green"]]
+    p2.tank = [game.generate_card([colour], random_colour=False) for colour in ["red", "red", "blue", "pink"]]
+    p3.tank = [game.generate_card([colour], random_colour=False) for colour in ["pink"]]
+    return game
+
+
+def test_get_target_odds():
+    game = make_game()
+    game.deck = [game.generate_card(["red", "blue", "yellow"], random_colour=False)]
+    odds = analytics.get_target_odds(game.get_info())
+
+    assert odds["Player 1"]["success_probability"] == pytest.approx(1 / 3)
+    assert odds["Player 1"]["expected_cards_gained"] == pytest.approx(2 / 3)
+    assert odds["Player 1"]["expected_cards_denied"] == 0
+
+    assert odds["Player 2"]["success_probability"] == pytest.approx(2 / 3)
+    assert odds["Player 2"]["expected_cards_gained"] == pytest.approx((3 + 2) / 3)
+    assert odds["Player 2"]["expected_cards_denied"] == pytest.approx(3 / 3)
+
+    assert odds["Player 3"]["success_probability"] == 0
+    assert odds["Player 3"]["expected_cards_gained"] == 0
+
+
+def test_get_target_odds_matches_simulation():
+    """Plays out each of the three possible fronts and checks the average against the odds."""
+    back = ["pink", "green", "red"]
+    game = make_game()
+    game.deck = [game.generate_card(back, random_colour=False)]
+    odds = analytics.get_target_odds(game.get_info())
+
+    for target_name in ["Player 1", "Player 2", "Player 3"]:
+        successes = 0
+        cards_moved = 0
+        for front in back:
+            game = make_game()
+            card = game.generate_card(back, random_colour=False)
+            card.colour = front
+            game.deck = [card]
+            active_player = game.players[0]
+            result = active_player.action(active_player.get_player_object_from_name(target_name))
+            if result["outcome"] == "success":
+                successes += 1
+                cards_moved += result["cards_moved"]
+        assert odds[target_name]["success_probability"] == pytest.approx(successes / 3)
+        assert odds[target_name]["expected_cards_gained"] == pytest.approx(cards_moved / 3)
+
+
+def test_get_target_odds_empty_deck():
+    game = make_game()
+    odds = analytics.get_target_odds(game.get_info())
+    for player_odds in odds.values():
+        assert player_odds["success_probability"] == 0
+
+
+def test_target_odds_with_front_distribution():
+    game = tournament.setup_game([brains.QuantityBrain, brains.ScorerBrain, brains.RandomBrain], game_seed=2)
+    for _ in range(10):
+        game.simulate_turn()
+    info = game.get_info(shuffle=False)
+    flat = analytics.get_target_odds(info)
+    possible_colours = info.next_card_possible_colours
+    uniform = {colour: analytics.FRONT_CHANCE for colour in possible_colours}
+    assert analytics.get_target_odds(info, uniform) == flat
+
+    # Knowing the front makes success certain or impossible
+    certain = dict.fromkeys(possible_colours, 0.0)
+    certain[possible_colours[0]] = 1.0
+    for player_name, odds in analytics.get_target_odds(info, certain).items():
+        has_colour = info.colour_counts[player_name][possible_colours[0]] > 0
+        assert odds["success_probability"] == (1.0 if has_colour else 0.0)
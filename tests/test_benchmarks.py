@@ -0,0 +1,177 @@
+"""
+Benchmarks of the engine's hot paths, with regression thresholds.
+
+Needs pytest-benchmark (pip install pytest-benchmark), and is skipped without it.
+Run with --benchmark-disable to only check that they work, or --benchmark-only to skip the other tests.
+
+THRESHOLDS are absolute timings from a typical development machine, so they're only checked when the
+MANTIS_BENCHMARK_THRESHOLDS environment variable is set to 1. Then every benchmark fails if its mean time goes
+over its threshold:
+    MANTIS_BENCHMARK_THRESHOLDS=1 python -m pytest tests/test_benchmarks.py --benchmark-only
+"""
+
+import itertools
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import analytics
+import brains
+import mantis_logic
+import tournament
+import utils
+
+PLAYER_COUNTS = range(mantis_logic.MIN_PLAYERS, mantis_logic.MAX_PLAYERS + 1)
+FAST_BRAINS = [brains.RandomBrain, brains.ScorerBrain, brains.KleptoBrain, brains.BlueShellBrain, brains.QuantityBrain]
+LINEUPS = {
+    "mixed": FAST_BRAINS,
+    "scorer": [brains.ScorerBrain],
+    "klepto": [brains.KleptoBrain],
+    "quantity": [brains.QuantityBrain],
+}
+
+# Maximum mean seconds per call. Per-player entries are multiplied by the number of players.
+THRESHOLDS = {
+    "shuffle_deck": 200e-6,
+    "deal_cards": 20e-6,
+    "get_info": 10e-6,
+    "get_info_fields": 50e-6,
+    "decision": 10e-6,
+    "score_action": 20e-6,
+    "steal_action": 20e-6,
+    "get_matching_colours_in_list": 5e-6,
+    "move_colours_from_list": 10e-6,
+    "convert_colour_index_to_name": 5e-6,
+    "game": 5e-3,
+}
+PER_PLAYER = {"deal_cards", "get_info", "get_info_fields", "decision", "game"}
+CHECK_THRESHOLDS = os.environ.get("MANTIS_BENCHMARK_THRESHOLDS") == "1"
+
+
+def check_threshold(benchmark, name: str, num_of_players=1):
+    if benchmark.disabled or not CHECK_THRESHOLDS:
+        return
+    threshold = THRESHOLDS[name] * (num_of_players if name in PER_PLAYER else 1)
+    mean = benchmark.stats.stats.mean
+    assert mean < threshold, f"{name} regressed: {mean * 1e6:.1f} µs per call (threshold {threshold * 1e6:.1f} µs)"
+
+
+def get_lineup(lineup_name: str, num_of_players: int) -> list:
+    return list(itertools.islice(itertools.cycle(LINEUPS[lineup_name]), num_of_players))
+
+
+def setup_mid_game(num_of_players: int, turns=20):
+    """A game part way through, so tanks and score piles have realistic sizes."""
+    game = tournament.setup_game(get_lineup("mixed", num_of_players), game_seed=num_of_players)
+    for _ in range(turns):
+        if game.is_game_over():
+            break
+        game.simulate_turn()
+    return game
+
+
+@pytest.mark.parametrize("physical_deck", [False, True])
+def test_shuffle_deck(benchmark, physical_deck):
+    game = tournament.setup_game(get_lineup("mixed", 2), game_seed=0, physical_deck=physical_deck)
+    benchmark(game.shuffle_deck)
+    assert len(game.deck) == mantis_logic.DECK_SIZE
+    check_threshold(benchmark, "shuffle_deck")
+
+
+@pytest.mark.parametrize("num_of_players", PLAYER_COUNTS)
+def test_deal_cards(benchmark, num_of_players):
+    def setup():
+        game = tournament.add_players(mantis_logic.Mantis(), get_lineup("mixed", num_of_players))
+        game.shuffle_deck()
+        return (game,), {}
+
+    benchmark.pedantic(mantis_logic.Mantis.deal_cards, setup=setup, rounds=2000)
+    check_threshold(benchmark, "deal_cards", num_of_players)
+
+
+@pytest.mark.parametrize("num_of_players", PLAYER_COUNTS)
+def test_get_info(benchmark, num_of_players):
+    game = setup_mid_game(num_of_players)
+    benchmark(game.get_info)
+    check_threshold(benchmark, "get_info", num_of_players)
+
+
+@pytest.mark.parametrize("num_of_players", PLAYER_COUNTS)
+def test_get_info_fields(benchmark, num_of_players):
+    """get_info() plus every field a Brain might read, since the fields are computed lazily."""
+    game = setup_mid_game(num_of_players)
+
+    def read_info():
+        info = game.get_info()
+        return info.player_names, info.tank_colours, info.scores, info.tank_sizes, info.next_card_possible_colours
+
+    benchmark(read_info)
+    check_threshold(benchmark, "get_info_fields", num_of_players)
+
+
+@pytest.mark.parametrize("decision", ["get_target_odds", "QuantityBrain"])
+def test_decision(benchmark, decision):
+    """analytics.get_target_odds() against QuantityBrain's heuristic, each on a fresh Info."""
+    game = setup_mid_game(mantis_logic.MAX_PLAYERS, turns=30)
+    if decision == "get_target_odds":
+        benchmark(lambda: analytics.get_target_odds(game.get_info()))
+    else:
+        benchmark(lambda: brains.QuantityBrain().run(game.get_info()))
+    check_threshold(benchmark, "decision", mantis_logic.MAX_PLAYERS)
+
+
+@pytest.mark.parametrize("action", ["score_action", "steal_action"])
+def test_actions(benchmark, action):
+    base_game = setup_mid_game(mantis_logic.MAX_PLAYERS)
+
+    def setup():
+        game = base_game.copy()
+        player = game.players[game.turns % len(game.players)]
+        if action == "score_action":
+            return (player,), {}
+        return (player, game.players[(player.seat + 1) % len(game.players)]), {}
+
+    method = getattr(mantis_logic.Mantis.Player, action)
+    benchmark.pedantic(method, setup=setup, rounds=2000)
+    check_threshold(benchmark, action)
+
+
+@pytest.mark.parametrize("pile_type", [list, utils.CardPile])
+def test_get_matching_colours_in_list(benchmark, pile_type):
+    cards = pile_type(mantis_logic.PHYSICAL_DECK[:20])
+    benchmark(utils.get_matching_colours_in_list, cards, "blue")
+    check_threshold(benchmark, "get_matching_colours_in_list")
+
+
+@pytest.mark.parametrize("pile_type", [list, utils.CardPile])
+def test_move_colours_from_list(benchmark, pile_type):
+    def setup():
+        return (pile_type(mantis_logic.PHYSICAL_DECK[:20]), "blue", []), {}
+
+    benchmark.pedantic(utils.move_colours_from_list, setup=setup, rounds=2000)
+    check_threshold(benchmark, "move_colours_from_list")
+
+
+def test_convert_colour_index_to_name(benchmark):
+    def convert_all():
+        for colour_index in mantis_logic.COLOUR_INDEX_RANGE:
+            utils.convert_colour_index_to_name(colour_index)
+
+    benchmark(convert_all)
+    check_threshold(benchmark, "convert_colour_index_to_name")
+
+
+@pytest.mark.parametrize("lineup_name", LINEUPS)
+@pytest.mark.parametrize("num_of_players", PLAYER_COUNTS)
+def test_game_throughput(benchmark, lineup_name, num_of_players):
+    lineup = get_lineup(lineup_name, num_of_players)
+    seeds = itertools.count()
+
+    def play():
+        return tournament.play_game(tournament.setup_game(lineup, game_seed=next(seeds)))
+
+    game = benchmark.pedantic(play, rounds=50)
+    assert game.is_game_over()
+    check_threshold(benchmark, "game", num_of_players)
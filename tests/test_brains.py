@@ -1,6 +1,7 @@
 import pytest
 import brains
 import mantis_logic
+import tournament
 
 
 class TestRandomBrain:
@@ -207,4 +208,106 @@ class TestManualBrain:
         """ This code will wait for user input forever, so we don't actually run it.
         monkeypatch.setattr("builtins.input", lambda _: "not_a_player")
         result = self.game.simulate_turn()
-        """
\ No newline at end of file
+        """
+
+class TestSearchBrain:
+    def setup_method(self):
+        self.game = mantis_logic.Mantis()
+        self.p1 = self.game.Player(self.game, None, "Player 1")
+        self.p2 = self.game.Player(self.game, None, "Player 2")
+        self.p3 = self.game.Player(self.game, None, "Player 3")
+        self.game.start_game()
+        self.brain = brains.SearchBrain()
+        self.brain.node_budget = 200
+
+    def test_search_valid_target(self):
+        info = self.game.get_info()
+        assert self.brain.run(info) in ["Player 1", "Player 2", "Player 3"]
+
+    def test_search_obvious_score(self):
+        # Every possible colour scores 5 cards and wins, and nobody else has anything to steal
+        self.p1.score_pile = [self.game.Card() for _ in range(8)]
+        self.p1.tank = [self.game.generate_card([colour], random_colour=False) for colour in ["red", "orange", "yellow"]]
+        self.p2.tank = []
+        self.p3.tank = []
+        self.game.deck.append(self.game.generate_card(["red", "orange", "yellow"]))
+        info = self.game.get_info()
+        assert self.brain.run(info) == "Player 1"
+
+    def test_search_is_reproducible(self):
+        def run():
+            results = tournament.run_tournament([brains.SearchBrain, brains.QuantityBrain, brains.ScorerBrain], 3, seed=1)
+            return results.total_turns, results.wins
+
+        assert run() == run()
+
+    def test_search_leaves_game_alone(self):
+        deck = self.game.deck.copy()
+        tanks = [player.get_self_tank_colours() for player in self.game.players]
+        self.brain.run(self.game.get_info())
+        assert self.game.deck == deck
+        assert [player.get_self_tank_colours() for player in self.game.players] == tanks
+
+
+class CountingBrain(brains.ScorerBrain):
+    """Records every hook call, to test the Brain lifecycle."""
+
+    instances = 0
+
+    def __init__(self):
+        CountingBrain.instances += 1
+        self.player_name = None
+        self.games_started = 0
+        self.turn_results = 0
+        self.winners = []
+
+    def on_game_start(self, player_name, game_setup):
+        self.player_name = player_name
+        self.game_setup = game_setup
+        self.games_started += 1
+
+    def on_turn_result(self, result):
+        self.turn_results += 1
+
+    def on_game_end(self, winner_name):
+        self.winners.append(winner_name)
+
+
+class TestBrainLifecycle:
+    def test_hooks_are_detected(self):
+        assert brains.ScorerBrain.hooks == ()
+        assert CountingBrain.hooks == ("on_game_start", "on_turn_result", "on_game_end")
+
+    def test_players_get_their_own_instances(self):
+        game = mantis_logic.Mantis()
+        first = game.Player(game, brains.QuantityBrain, "Player 1")
+        second = game.Player(game, brains.QuantityBrain, "Player 2")
+        assert isinstance(first.brain, brains.QuantityBrain)
+        assert first.brain is not second.brain
+        instance = brains.QuantityBrain()
+        assert game.Player(game, instance, "Player 3").brain is instance
+
+    def test_hooks_are_called(self):
+        game = mantis_logic.Mantis()
+        counting = game.Player(game, CountingBrain, "Counter")
+        game.Player(game, brains.KleptoBrain, "Klepto")
+        game.start_game()
+        assert counting.brain.player_name == "Counter"
+        while not game.is_game_over():
+            game.simulate_turn()
+        assert counting.brain.turn_results == game.turns
+        winner = game.get_winner()
+        assert counting.brain.winners == [None if winner is None else winner.name]
+
+    def test_tournament_keeps_brains_warm(self):
+        import tournament
+
+        CountingBrain.instances = 0
+        tournament.run_tournament([CountingBrain, brains.QuantityBrain], n_games=10, seed=1)
+        assert CountingBrain.instances == 1
+
+        counting = CountingBrain()
+        results = tournament.run_tournament([counting, brains.QuantityBrain], n_games=10, seed=1)
+        assert results.player_names == ["Counting", "Quantity"]
+        assert counting.games_started == len(counting.winners) == 10
+        assert counting.winners.count("Counting") == results.wins[0]
@@ -0,0 +1,53 @@
+import brains
+import deck_tracker
+import mantis_logic
+import tournament
+
+
+def test_flat_odds_without_physical_deck():
+    tracker = deck_tracker.DeckTracker(physical_deck=False)
+    tracker.observe(["red", "orange", "yellow"], "red")
+    assert tracker.get_front_distribution(["red", "orange", "yellow"]) == {
+        "red": deck_tracker.FLAT_CHANCE,
+        "orange": deck_tracker.FLAT_CHANCE,
+        "yellow": deck_tracker.FLAT_CHANCE,
+    }
+    assert tracker.get_front_distribution([]) == {}
+
+
+def test_seen_fronts_are_ruled_out():
+    tracker = deck_tracker.DeckTracker()
+    back = ["red", "orange", "yellow"]
+    assert tracker.get_front_distribution(back)["red"] == deck_tracker.FLAT_CHANCE
+    tracker.observe(back, "red")
+    assert tracker.get_front_distribution(back) == {"red": 0.0, "orange": 0.5, "yellow": 0.5}
+    tracker.observe(["yellow", "red", "orange"], "yellow")  # Backs match whatever order their colours are in
+    assert tracker.get_front_distribution(back) == {"red": 0.0, "orange": 1.0, "yellow": 0.0}
+    assert tracker.get_front_distribution(["red", "orange", "green"])["red"] == deck_tracker.FLAT_CHANCE
+    assert tracker.cards_seen == 2
+
+
+def test_tracker_follows_a_physical_game():
+    counting = brains.CardCountingBrain()
+    game = tournament.setup_game([counting, brains.QuantityBrain], game_seed=3, physical_deck=True)
+    tracker = counting.tracker
+    assert tracker.physical_deck
+    assert tracker.cards_seen == 2 * mantis_logic.STARTING_TANK_SIZE
+    while not game.is_game_over():
+        # The tracker's odds always give the next card's real front a chance
+        next_card = game.deck[-1]
+        distribution = tracker.get_front_distribution(next_card.possible_colours)
+        assert distribution[next_card.colour] > 0
+        assert abs(sum(distribution.values()) - 1) < 1e-9
+        game.simulate_turn()
+    assert tracker.cards_seen == mantis_logic.DECK_SIZE - len(game.deck)
+    # Only the unseen cards are left
+    unseen = sum(count for fronts in tracker.unseen.values() for count in fronts.values())
+    assert unseen == len(game.deck)
+
+
+def test_card_counting_brain_plays():
+    results = tournament.run_tournament(
+        [brains.CardCountingBrain, brains.QuantityBrain], n_games=20, seed=4, physical_deck=True
+    )
+    assert results.games == 20
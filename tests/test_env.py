@@ -0,0 +1,86 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import brains
+import env
+import neural
+
+
+def play_episodes(vector_env, choose_actions, steps=300):
+    observations = vector_env.reset()
+    total_rewards = []
+    for _ in range(steps):
+        observations, rewards, dones, infos = vector_env.step(choose_actions(observations))
+        assert observations.shape == (vector_env.num_envs, neural.STATE_SIZE)
+        for env_index in np.flatnonzero(dones):
+            total_rewards.append(rewards[env_index])
+            assert infos[env_index]["final_observation"].shape == (neural.STATE_SIZE,)
+        assert (rewards[~dones] == 0).all()
+    return total_rewards
+
+
+def test_reset():
+    vector_env = env.MantisVectorEnv(4, [brains.QuantityBrain, brains.KleptoBrain], agent_seat=1, seed=1)
+    observations = vector_env.reset()
+    assert observations.shape == (4, neural.STATE_SIZE)
+    assert observations.dtype == np.float32
+    # It's always the agent's turn
+    for game, agent in zip(vector_env.games, vector_env.agents):
+        assert game.players[game.turns % 3] is agent
+        assert agent.seat == 1
+    assert vector_env.action_masks()[0].tolist() == [True, True, True, False, False, False]
+
+
+def test_episodes_auto_reset():
+    vector_env = env.MantisVectorEnv(8, [brains.QuantityBrain], seed=2)
+    rewards = play_episodes(vector_env, lambda observations: np.zeros(len(observations), dtype=int))
+    assert len(rewards) > 8
+    assert set(rewards) <= {-1.0, 0.0, 1.0}
+    assert vector_env.episodes == 8 + len(rewards)
+
+
+def test_always_scoring_beats_klepto():
+    # Action 0 targets the agent itself, which always wins against a Brain that never scores
+    vector_env = env.MantisVectorEnv(4, [brains.KleptoBrain, brains.KleptoBrain], seed=3)
+    rewards = play_episodes(vector_env, lambda observations: np.zeros(len(observations), dtype=int))
+    assert rewards and all(reward == 1.0 for reward in rewards)
+
+
+def test_env_is_seeded():
+    def run():
+        vector_env = env.MantisVectorEnv(3, [brains.RandomBrain, brains.BlueShellBrain], seed=4)
+        rng = np.random.default_rng(0)
+        return play_episodes(vector_env, lambda observations: rng.integers(0, 3, len(observations)), steps=100)
+
+    assert run() == run()
+
+
+def test_invalid_action():
+    vector_env = env.MantisVectorEnv(2, [brains.ScorerBrain], seed=5)
+    vector_env.reset()
+    turns = [game.turns for game in vector_env.games]
+    with pytest.raises(ValueError):
+        vector_env.step([0, 2])
+    with pytest.raises(ValueError):
+        vector_env.step([0, -1])
+    with pytest.raises(ValueError):
+        vector_env.step([0.0, 1.0])
+    with pytest.raises(ValueError):
+        vector_env.step([0])
+    # Nothing was played, even in the environments with valid actions
+    assert [game.turns for game in vector_env.games] == turns
+
+
+def test_final_observation_is_the_agents():
+    vector_env = env.MantisVectorEnv(1, [brains.QuantityBrain, brains.QuantityBrain], agent_seat=2, seed=6)
+    vector_env.reset()
+    while True:
+        agent = vector_env.agents[0]
+        _, _, dones, infos = vector_env.step([0])
+        if dones[0]:
+            break
+    # The first seat of the encoding is the agent's: its score is the agent's share of the goal
+    final_observation = infos[0]["final_observation"]
+    score_feature = neural.SEAT_FEATURES - 2
+    assert final_observation[score_feature] == pytest.approx(len(agent.score_pile) / agent.game.goal)
@@ -0,0 +1,53 @@
+import brains
+import evaluation
+
+
+def test_sprt_bounds():
+    test = evaluation.SPRT(0.5, 0.55)
+    assert test.get_decision(0, 0) == evaluation.INCONCLUSIVE
+    assert test.get_decision(1000, 600) == evaluation.BETTER
+    assert test.get_decision(500, 600) == evaluation.NOT_BETTER
+    assert test.get_llr(10, 10) < 0  # An even record favours H0
+    assert test.get_fixed_sample_size() == 1077
+    assert evaluation.SPRT(0.5, 0.6).get_fixed_sample_size() < 1077
+
+
+def test_better_brain_stops_early():
+    result = evaluation.evaluate(brains.ScorerBrain, [brains.KleptoBrain], batch_size=20, max_games=2000, seed=1)
+    assert result.decision == evaluation.BETTER
+    assert result.games < 2000
+    assert result.games_saved == result.fixed_games - result.games > 0
+    low, high = result.win_rate_interval()
+    assert low > 0.5
+
+
+def test_worse_brain_is_rejected():
+    result = evaluation.evaluate(brains.KleptoBrain, [brains.ScorerBrain], batch_size=20, max_games=2000, seed=2)
+    assert result.decision == evaluation.NOT_BETTER
+    assert result.games < 2000
+
+
+def test_budget_runs_out():
+    result = evaluation.evaluate(
+        brains.ScorerBrain, [brains.ScorerBrain, brains.ScorerBrain], batch_size=5, max_games=15, seed=3
+    )
+    assert result.decision == evaluation.INCONCLUSIVE
+    assert result.games == 15
+    assert result.games_saved == result.fixed_games - 15
+
+
+def test_paired_identical_brains():
+    # The same Brain on the same decks and seeds plays identical games
+    result = evaluation.evaluate_paired(brains.QuantityBrain, brains.QuantityBrain, [brains.RandomBrain], n_decks=20)
+    assert result.pairs == 40
+    assert result.candidate_results == result.baseline_results
+    assert result.mean_difference() == 0
+    assert result.standard_error() == 0
+
+
+def test_paired_reduces_variance():
+    result = evaluation.evaluate_paired(
+        brains.ScorerBrain, brains.BlueShellBrain, [brains.QuantityBrain], n_decks=150, seed=4
+    )
+    assert result.mean_difference() > 0
+    assert result.variance_reduction() > 1
@@ -0,0 +1,98 @@
+import pytest
+
+import brains
+import game_history
+import mantis_logic
+import tournament
+
+
+def play_sample_game():
+    game = tournament.setup_game([brains.RandomBrain, brains.QuantityBrain, brains.ScorerBrain], game_seed=1)
+    results = []
+    while not game.is_game_over():
+        results.append(game.simulate_turn())
+    return game, results
+
+
+def test_game_history_matches_results():
+    game, results = play_sample_game()
+    assert len(game.history) == len(results)
+    assert len(game.history.records) == 4 * len(results)
+    # The back of the drawn card isn't stored
+    for result in results:
+        assert len(result.pop("card_possible_colours")) == mantis_logic.NUM_OF_POSSIBLE_COLOURS_PER_CARD
+    assert list(game.history) == results
+    assert game.history[-1] == results[-1]
+
+
+def test_history_without_results():
+    # Playing without building result dicts packs the same history
+    game, results = play_sample_game()
+    fast_game = tournament.setup_game([brains.RandomBrain, brains.QuantityBrain, brains.ScorerBrain], game_seed=1)
+    while not fast_game.is_game_over():
+        assert fast_game.simulate_turn(return_result=False) is None
+    assert fast_game.history.records == game.history.records
+
+
+def test_get_turn():
+    game = mantis_logic.Mantis()
+    game.Player(game, None, "Player 1")
+    game.Player(game, None, "Player 2")
+    game.history.append_turn(1, 0, 5, 3, True)
+    assert game.history.get_turn(0) == (1, 0, 5, 3, True)
+    assert game.history[0] == {
+        "card_actual_colour": "blue",
+        "cards_moved": 3,
+        "outcome": "success",
+        "action": "steal",
+        "active_player": "Player 2",
+        "target": "Player 1",
+    }
+    assert game.get_last_history_text(1) == "Player 2 successfully stole 3 💙 cards from Player 1."
+    assert game.get_last_history_text(5) == "No history."
+
+
+def test_write_and_read(tmp_path):
+    path = tmp_path / "games.bin"
+    games = [play_sample_game()[0] for _ in range(3)]
+    with open(path, "wb") as file:
+        writer = game_history.HistoryWriter(file, ["Random", "Quantity", "Scorer"], False, 10)
+        for seed, game in enumerate(games):
+            writer.write_game(game, seed)
+
+    with game_history.HistoryReader(path) as reader:
+        assert reader.player_names == ["Random", "Quantity", "Scorer"]
+        assert reader.physical_deck is False
+        assert reader.goal == 10
+        assert len(reader) == 3
+        for seed, (game, record) in enumerate(zip(games, reader)):
+            assert record.seed == seed
+            assert list(record.history) == list(game.history)
+            assert record.history.get_target_seats() == game.history.get_target_seats()
+
+
+def test_tournament_history(tmp_path):
+    lineup = [brains.RandomBrain, brains.KleptoBrain, brains.QuantityBrain]
+    serial_path = tmp_path / "serial.bin"
+    parallel_path = tmp_path / "parallel.bin"
+    results = tournament.run_tournament(lineup, n_games=12, seed=9, history_path=serial_path)
+    tournament.run_tournament(lineup, n_games=12, seed=9, workers=2, history_path=parallel_path)
+    assert serial_path.read_bytes() == parallel_path.read_bytes()
+
+    with game_history.HistoryReader(serial_path) as reader:
+        assert len(reader) == 12
+        assert sum(len(record.history) for record in reader) == results.total_turns
+        assert reader[0].seed == tournament.derive_game_seed(9, 0)
+
+
+def test_read_bad_files(tmp_path):
+    path = tmp_path / "games.bin"
+    with open(path, "wb") as file:
+        writer = game_history.HistoryWriter(file, ["Random", "Quantity", "Scorer"], False, 10)
+        writer.write_game(play_sample_game()[0], 1)
+    data = path.read_bytes()
+
+    for bad_data in (b"", data[:10], data[:20], data[:-1]):
+        path.write_bytes(bad_data)
+        with pytest.raises(ValueError):
+            game_history.HistoryReader(path)
@@ -0,0 +1,82 @@
+import brains
+import league
+
+LINEUP = [brains.ScorerBrain, brains.RandomBrain, brains.KleptoBrain]
+
+
+def test_win_rate_interval():
+    low, high = league.get_win_rate_interval(50, 100)
+    assert low < 0.5 < high
+    assert abs((0.5 - low) - (high - 0.5)) < 1e-9
+    narrow_low, narrow_high = league.get_win_rate_interval(500, 1000)
+    assert high - low > narrow_high - narrow_low
+    assert league.get_win_rate_interval(0, 0) == (0.0, 1.0)
+
+
+def test_expected_score():
+    assert league.get_expected_score(1500, 1500) == 0.5
+    assert abs(league.get_expected_score(1900, 1500) - 10 / 11) < 1e-9
+
+
+def test_round_robin():
+    test_league = league.League(LINEUP, table_size=2, batch_size=20, max_games=80, min_games=40, seed=1)
+    test_league.run_round_robin()
+    assert len(test_league.tables) == 3
+    for table in test_league.tables.values():
+        assert 0 < table.games <= 80
+        # Every Brain gets every seat equally often
+        assert len(set(table.games_per_rotation)) == 1
+        assert sum(table.wins) + table.draws == table.games
+    assert sum(test_league.games_played.values()) == 2 * sum(table.games for table in test_league.tables.values())
+    standings = test_league.standings()
+    assert standings[0][0] is brains.ScorerBrain
+    assert standings[-1][0] is brains.KleptoBrain
+
+
+def test_ratings_are_zero_sum():
+    test_league = league.League(LINEUP, table_size=3, batch_size=10, max_games=30, seed=2)
+    test_league.run_round_robin()
+    assert abs(sum(test_league.ratings.values()) - 3 * league.DEFAULT_RATING) < 1e-6
+
+
+def test_early_stop():
+    lopsided = [brains.ScorerBrain, brains.KleptoBrain]
+    test_league = league.League(lopsided, batch_size=50, max_games=5000, min_games=100, precision=0.1, seed=3)
+    table = test_league.play_table(lopsided)
+    assert table.converged
+    assert table.games < 5000
+    # Converged tables don't play any more games
+    assert test_league.play_table(lopsided).games == table.games
+
+
+def test_league_is_seeded():
+    first = league.League(LINEUP, batch_size=10, max_games=20, seed=4).run_round_robin()
+    second = league.League(LINEUP, batch_size=10, max_games=20, seed=4).run_round_robin()
+    assert first.as_dict() == second.as_dict()
+
+
+def test_swiss_tables():
+    pool = [brains.ScorerBrain, brains.RandomBrain, brains.KleptoBrain, brains.BlueShellBrain, brains.QuantityBrain]
+    test_league = league.League(pool, table_size=2, batch_size=10, max_games=20, seed=5)
+    tables = test_league.get_swiss_tables()
+    assert len(tables) == 2  # The fifth Brain sits the round out
+    assert len({brain for table in tables for brain in table}) == 4
+    test_league.run_swiss(rounds=3)
+    assert test_league.rounds_played == 3
+    # Finished pairings aren't repeated while there are fresh ones
+    assert len(test_league.tables) == 6
+
+
+def test_brain_instances():
+    pool = [brains.ScorerBrain(), brains.KleptoBrain()]
+    test_league = league.League(pool, batch_size=10, max_games=20, seed=6).run_round_robin()
+    as_dict = test_league.as_dict()
+    assert set(as_dict["ratings"]) == {"ScorerBrain", "KleptoBrain"}
+    assert as_dict["tables"][0]["brains"] == ["ScorerBrain", "KleptoBrain"]
+
+
+def test_update_ratings_without_games():
+    test_league = league.League(LINEUP, seed=7)
+    test_league.update_ratings(LINEUP, [0, 0, 0], 0)
+    assert set(test_league.ratings.values()) == {league.DEFAULT_RATING}
+    assert set(test_league.games_played.values()) == {0}
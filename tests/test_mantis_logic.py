@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 import mantis_logic
 import brains
@@ -262,3 +264,325 @@ def test_out_of_cards():
         assert not game.game_over_message()
         game.simulate_turn()
     assert game.game_over_message() == "Ran out of cards"
+
+
+def test_get_winner():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+
+    p1.score_pile = [game.Card(), game.Card()]
+    p2.score_pile = [game.Card()]
+    assert game.get_winner() is p1
+
+    # Tied on score, so the bigger tank wins
+    p2.score_pile = [game.Card(), game.Card()]
+    p1.tank = [game.Card()]
+    p2.tank = [game.Card(), game.Card()]
+    assert game.get_winner() is p2
+
+    # Tied on both
+    p1.tank = [game.Card(), game.Card()]
+    assert game.get_winner() is None
+
+
+def test_is_game_over():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    game.Player(game, None, "Player 2")
+    game.start_game()
+    assert game.is_game_over() is False
+
+    p1.score_pile = [game.Card() for _ in range(game.goal)]
+    assert game.is_game_over() is True
+    assert game.game_over_message() == f"Player 1 won with a score of {game.goal}!"
+
+
+def test_seeded_games_are_identical():
+    import random
+
+    decks = []
+    for _ in range(2):
+        game = mantis_logic.Mantis(random.Random(42))
+        game.Player(game, None, "Player 1")
+        game.Player(game, None, "Player 2")
+        game.start_game()
+        decks.append([(card.possible_colours, card.colour) for card in game.deck])
+    assert decks[0] == decks[1]
+
+
+def test_compact_card():
+    game = mantis_logic.Mantis()
+    card = game.generate_card(["blue", "purple", "pink"], random_colour=False)
+    assert card.back == (5, 6, 7)
+    assert card.front == 5
+    assert not hasattr(card, "__dict__")
+
+    assert card.back_mask == 0b1110000
+    assert card.code == (0b1110000 << 3) | 5
+    decoded = game.Card.from_code(card.code)
+    assert decoded.possible_colours == ["blue", "purple", "pink"]
+    assert decoded.colour == "blue"
+
+    card.colour = "pink"
+    assert card.front == 7
+    assert card.colour == "pink"
+
+
+def test_card_backs():
+    assert len(mantis_logic.CARD_BACKS) == 35
+    assert len(set(mantis_logic.CARD_BACKS)) == 35
+    card = mantis_logic.Mantis.Card()
+    assert card.back in mantis_logic.CARD_BACKS
+    assert card.front in card.back
+
+
+def test_shuffle_deck():
+    game = mantis_logic.Mantis()
+    game.shuffle_deck()
+    assert len(game.deck) == mantis_logic.DECK_SIZE
+    for card in game.deck:
+        assert card.back in mantis_logic.CARD_BACKS
+        assert card.colour in card.possible_colours
+
+
+def test_physical_deck():
+    game = mantis_logic.Mantis()
+    game.physical_deck = True
+    game.shuffle_deck()
+    assert len(game.deck) == mantis_logic.DECK_SIZE
+    pairs = {(card.back, card.front) for card in game.deck}
+    assert len(pairs) == mantis_logic.DECK_SIZE
+    # Every colour is on the front of exactly 15 cards
+    for colour_index in range(1, mantis_logic.NUM_OF_COLOURS + 1):
+        assert sum(card.front == colour_index for card in game.deck) == 15
+
+
+
+def test_physical_deck_cards_are_frozen():
+    card = mantis_logic.PHYSICAL_DECK[0]
+    back, front = card.back, card.front
+    with pytest.raises(AttributeError):
+        card.colour = "pink"
+    with pytest.raises(AttributeError):
+        card.assign_random_possible_colours()
+    with pytest.raises(AttributeError):
+        card.front = 1
+    assert (card.back, card.front) == (back, front)
+    copied = pickle.loads(pickle.dumps(card))
+    assert (copied.back, copied.front) == (back, front)
+
+def test_get_info_is_lazy():
+    game = mantis_logic.Mantis()
+    game.Player(game, None, "Player 1")
+    game.Player(game, None, "Player 2")
+    game.start_game()
+
+    info = game.get_info()
+    assert "tank_colours" not in vars(info)
+    assert "scores" not in vars(info)
+    tank_colours = info.tank_colours
+    assert info.tank_colours is tank_colours  # Memoized
+    assert list(info.scores) == info.player_names == list(tank_colours)
+
+
+
+def test_get_info_goes_stale():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, brains.ScorerBrain, "Player 1")
+    p2 = game.Player(game, brains.ScorerBrain, "Player 2")
+    game.start_game()
+    info = game.get_info()
+    scores = info.scores
+    game.simulate_turn()
+    # Fields read before the turn still describe it, and fields read after it refuse to mix in the new state
+    assert info.scores is scores
+    with pytest.raises(RuntimeError):
+        info.tank_colours
+    assert info.cards_left == len(game.deck) + 1
+
+    info = game.get_info(shuffle=False, active_player=p1)
+    assert game.players[game.turns % 2] is p2
+    assert info.active_player is p1
+    assert info.turn_order == ["Player 1", "Player 2"]
+
+def test_get_info_hides_game():
+    game = mantis_logic.Mantis()
+    game.Player(game, None, "Player 1")
+    game.Player(game, None, "Player 2")
+    game.start_game()
+
+    info = game.get_info()
+    info.player_names, info.tank_colours, info.scores, info.next_card_possible_colours
+    for value in vars(info).values():
+        assert value is not game
+        assert value is not game.deck
+
+
+def test_score_leader():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+    assert game.get_highest_score_player() is p1
+
+    p2.score_pile = [game.Card()]
+    assert game.get_highest_score_player() is p2
+    p1.score_pile = [game.Card()]
+    assert game.get_highest_score_player() is p1  # Ties go to the first player
+
+    sample_cards = SampleCards()
+    p2.tank = [sample_cards.red_card]
+    game.deck = [sample_cards.red_card]
+    p2.score_action()
+    assert len(p2.score_pile) == 3
+    assert game.get_highest_score_player() is p2
+
+
+
+def test_score_leader_sees_pile_changes():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+    game.deck = [game.Card()]
+    p1.score_pile = [game.Card()]
+    # Changing a score pile in place, without assigning it, still updates the leader and ends the game
+    p2.score_pile.extend(game.Card() for _ in range(game.goal))
+    assert game.get_highest_score_player() is p2
+    assert game.game_over_message() == f"Player 2 won with a score of {game.goal}!"
+
+    p2.score_pile.clear()
+    assert game.get_highest_score_player() is p1
+    assert not game.is_game_over()
+    p1.tank = [game.Card.from_code(1), game.Card.from_code(1)]
+    mantis_logic.move_colours_from_tank(p1, 1, p2.score_pile)
+    assert game.get_highest_score_player() is p2
+    p2.score_pile.pop()
+    p2.score_pile.remove(p2.score_pile[0])
+    assert game.get_highest_score_player() is p1
+
+def test_score_leader_matches_scan():
+    game = mantis_logic.Mantis()
+    game.Player(game, brains.ScorerBrain, "Player 1")
+    game.Player(game, brains.RandomBrain, "Player 2")
+    game.Player(game, brains.BlueShellBrain, "Player 3")
+    game.start_game()
+    while not game.game_over_message():
+        game.simulate_turn()
+        leader = game.get_highest_score_player()
+        game.refresh_score_leader()
+        assert leader is game.get_highest_score_player()
+
+
+def test_get_info_tank_sizes():
+    game = mantis_logic.Mantis()
+    sample_cards = SampleCards()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+    p1.tank = [sample_cards.green_card, sample_cards.green_card, sample_cards.red_card]
+
+    info = game.get_info(shuffle=False)
+    assert info.tank_sizes == {"Player 1": 3, "Player 2": 0}
+    assert info.colour_counts["Player 1"]["green"] == 2
+    assert info.colour_counts["Player 1"]["red"] == 1
+    assert sum(info.colour_counts["Player 2"].values()) == 0
+
+
+def test_copy():
+    game = mantis_logic.Mantis()
+    game.Player(game, brains.ScorerBrain, "Player 1")
+    game.Player(game, brains.KleptoBrain, "Player 2")
+    game.start_game()
+    game.simulate_turn()
+
+    copy = game.copy()
+    assert [player.name for player in copy.players] == ["Player 1", "Player 2"]
+    assert copy.turns == game.turns
+    assert copy.deck == game.deck
+    for player, copied_player in zip(game.players, copy.players):
+        assert copied_player.game is copy
+        assert copied_player.tank == player.tank
+        assert copied_player.score_pile == player.score_pile
+
+    tanks = [player.get_self_tank_colours() for player in game.players]
+    deck_size = len(game.deck)
+    while not copy.game_over_message():
+        copy.simulate_turn()
+    assert [player.get_self_tank_colours() for player in game.players] == tanks
+    assert len(game.deck) == deck_size
+
+
+def test_from_info():
+    game = mantis_logic.Mantis()
+    p1 = game.Player(game, None, "Player 1")
+    p2 = game.Player(game, None, "Player 2")
+    game.Player(game, None, "Player 3")
+    game.start_game()
+    p2.score_pile = [game.Card(), game.Card()]
+    game.turns = 1
+
+    info = game.get_info()
+    sandbox = mantis_logic.Mantis.from_info(info)
+    # Seated in turn order, however the Info's player_names are shuffled
+    assert [player.name for player in sandbox.players] == ["Player 2", "Player 3", "Player 1"]
+    assert sandbox.players[sandbox.turns % 3].name == "Player 2"
+    assert sandbox.players[0].get_self_tank_colours() == p2.get_self_tank_colours()
+    assert sandbox.players[2].get_self_tank_colours() == p1.get_self_tank_colours()
+    assert len(sandbox.players[0].score_pile) == 2
+    assert len(sandbox.deck) == len(game.deck)
+    assert sandbox.deck[-1].possible_colours == game.deck[-1].possible_colours
+
+
+def get_game_state(game):
+    """Everything apply_move() can change, for checking that undo_move() restores it."""
+    return (
+        game.turns,
+        list(game.deck),
+        game.score_leader,
+        [(list(player.tank), list(player.score_pile)) for player in game.players],
+    )
+
+
+def test_apply_and_undo_move():
+    import random
+
+    rng = random.Random(3)
+    for _ in range(20):
+        game = mantis_logic.Mantis(random.Random(rng.random()))
+        for i in range(rng.randint(mantis_logic.MIN_PLAYERS, mantis_logic.MAX_PLAYERS)):
+            game.Player(game, None, f"Player {i + 1}")
+        game.start_game()
+
+        moves = []
+        states = []
+        while not game.is_game_over():
+            states.append(get_game_state(game))
+            moves.append(game.apply_move(rng.randrange(len(game.players))))
+
+        # Undoing one move at a time passes back through every earlier state
+        while moves:
+            game.undo_move(moves.pop())
+            assert get_game_state(game) == states.pop()
+
+
+def test_apply_move_matches_actions():
+    import random
+
+    for seed in range(10):
+        game = mantis_logic.Mantis(random.Random(seed))
+        game.Player(game, None, "Player 1")
+        game.Player(game, None, "Player 2")
+        game.Player(game, None, "Player 3")
+        game.start_game()
+        copy = game.copy()
+        rng = random.Random(seed)
+        while not game.is_game_over():
+            target_seat = rng.randrange(3)
+            move = game.apply_move(target_seat)
+            active_player = copy.players[copy.turns % 3]
+            result = active_player.action(copy.players[target_seat])
+            copy.turns += 1
+            assert move.cards_moved == result["cards_moved"]
+            assert move.success == (result["outcome"] == "success")
+            for player, copied_player in zip(game.players, copy.players):
+                assert player.get_self_tank_colours() == copied_player.get_self_tank_colours()
+                assert len(player.score_pile) == len(copied_player.score_pile)
@@ -0,0 +1,64 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import brains
+import mantis_logic
+import neural
+import tournament
+
+
+def test_state_size_is_fixed():
+    for num_of_players in range(mantis_logic.MIN_PLAYERS, mantis_logic.MAX_PLAYERS + 1):
+        lineup = [brains.QuantityBrain] * num_of_players
+        game = tournament.setup_game(lineup, game_seed=num_of_players)
+        state = neural.encode_info(game.get_info())
+        assert state.shape == (neural.STATE_SIZE,)
+        taken = state[: neural.BACK_OFFSET : neural.SEAT_FEATURES]
+        assert list(taken) == [1.0] * num_of_players + [0.0] * (mantis_logic.MAX_PLAYERS - num_of_players)
+
+
+def test_encoding_follows_turn_order():
+    game = tournament.setup_game([brains.ScorerBrain, brains.KleptoBrain, brains.QuantityBrain], game_seed=1)
+    game.simulate_turn()
+    info = game.get_info(shuffle=True)
+    assert info.turn_order == ["Klepto", "Quantity", "Scorer"]
+    state = neural.encode_info(info)
+    for slot, player in enumerate([game.players[1], game.players[2], game.players[0]]):
+        offset = slot * neural.SEAT_FEATURES
+        counts = state[offset + 1 : offset + 1 + mantis_logic.NUM_OF_COLOURS] * neural.COUNT_SCALE
+        assert list(np.rint(counts)) == list(player.tank.colour_counts().values())
+        assert state[offset + 1 + mantis_logic.NUM_OF_COLOURS] == len(player.score_pile) / game.goal
+    back = state[neural.BACK_OFFSET : neural.BACK_OFFSET + mantis_logic.NUM_OF_COLOURS]
+    assert [colour_index + 1 for colour_index in np.flatnonzero(back)] == list(game.deck[-1].back)
+    assert state[-1] == len(game.deck) / mantis_logic.DECK_SIZE
+
+
+def test_batch_matches_single_decisions():
+    brain = neural.NeuralBrain()
+    infos = []
+    for seed in range(8):
+        game = tournament.setup_game([brains.QuantityBrain] * (2 + seed % 5), game_seed=seed)
+        infos.append(game.get_info())
+    batch_targets = brain.run_batch(infos)
+    assert batch_targets == [brain.run(info) for info in infos]
+    for info, target in zip(infos, batch_targets):
+        assert target in info.player_names
+
+
+def test_model_save_and_load(tmp_path):
+    model = neural.MLP(seed=3)
+    path = tmp_path / "model.npz"
+    model.save(path)
+    loaded = neural.MLP.load(path)
+    states = np.random.default_rng(0).random((5, neural.STATE_SIZE), dtype=np.float32)
+    assert np.array_equal(model.forward(states), loaded.forward(states))
+
+
+def test_play_games_batched():
+    lineup = [neural.NeuralBrain, brains.QuantityBrain, brains.ScorerBrain]
+    results = neural.play_games_batched(lineup, n_games=30, seed=2)
+    assert results.games == 30
+    assert sum(results.wins) + results.draws == 30
+    again = neural.play_games_batched(lineup, n_games=30, seed=2)
+    assert again.as_dict() == results.as_dict()
@@ -0,0 +1,57 @@
+import brains
+import profiling
+import tournament
+
+LINEUP = [brains.ScorerBrain, brains.QuantityBrain, brains.KleptoBrain]
+
+
+def test_profiled_results_match():
+    plain = tournament.run_tournament(LINEUP, n_games=20, seed=1)
+    profiled = tournament.run_tournament(LINEUP, n_games=20, seed=1, profile=True)
+    assert plain.profiler is None
+    assert profiled.as_dict() == plain.as_dict()
+
+    profiler = profiled.profiler
+    assert profiler.turns == profiled.total_turns
+    assert profiler.phase_counts["setup"] == 20
+    assert profiler.phase_counts["get_info"] == profiler.phase_counts["decision"] == profiler.turns
+    assert profiler.phase_counts["score_action"] + profiler.phase_counts["steal_action"] == profiler.turns
+    assert set(profiler.brain_latencies) == {"ScorerBrain", "QuantityBrain", "KleptoBrain"}
+    assert sum(latency.count for latency in profiler.brain_latencies.values()) == profiler.turns
+
+
+def test_parallel_profiles_merge():
+    results = tournament.run_tournament(LINEUP, n_games=20, seed=2, workers=2, profile=True)
+    assert results.profiler.turns == results.total_turns
+    assert results.profiler.phase_counts["setup"] == 20
+
+
+def test_latency_histogram():
+    latency = profiling.BrainLatency()
+    for microseconds in (0.5, 3, 3, 3, 100):
+        latency.add(microseconds / 1e6)
+    assert latency.count == 5
+    assert sum(latency.histogram) == 5
+    assert latency.histogram[profiling.get_bucket(3e-6)] == 3
+    assert latency.percentile(0.5) == profiling.get_bucket_upper_bound(profiling.get_bucket(3e-6))
+    assert latency.percentile(1) == latency.max == 100e-6
+
+
+def test_report_lists_slowest_brain_first():
+    results = tournament.run_tournament([brains.SearchBrain, brains.ScorerBrain], n_games=2, seed=3, profile=True)
+    assert results.profiler.slowest_brains()[0][0] == "SearchBrain"
+    report = results.profiler.report()
+    assert report.index("SearchBrain") < report.index("ScorerBrain")
+    assert "decision" in report
+
+
+def test_take_turn_is_profiled():
+    game = tournament.setup_game(LINEUP, game_seed=4)
+    game.profiler = profiling.Profiler()
+    for _ in range(3):
+        game.record_turn(game.players[game.turns % len(game.players)].take_turn())
+    profiler = game.profiler
+    assert profiler.turns == 3
+    for phase in ("get_info", "decision", "helpers", "history"):
+        assert profiler.phase_counts[phase] == 3
+    assert profiler.phase_counts["score_action"] + profiler.phase_counts["steal_action"] == 3
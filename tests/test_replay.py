@@ -0,0 +1,71 @@
+import brains
+import tournament
+from game_history import HistoryReader
+from replay import Replay
+
+LINEUP = [brains.RandomBrain, brains.BlueShellBrain, brains.KleptoBrain, brains.QuantityBrain]
+
+
+def test_replay_matches_tournament(tmp_path):
+    path = tmp_path / "games.bin"
+    tournament.run_tournament(LINEUP, n_games=10, seed=5, history_path=path)
+
+    with HistoryReader(path) as reader:
+        for game_index, record in enumerate(reader):
+            replay = Replay.from_file(path, game_index)
+            while replay.step():
+                pass
+            assert bytes(replay.game.history.records) == bytes(record.history.records)
+            assert replay.game.is_game_over()
+
+
+def test_replay_uses_file_deck_settings(tmp_path):
+    path = tmp_path / "games.bin"
+    tournament.run_tournament(LINEUP, n_games=5, seed=5, physical_deck=True, history_path=path)
+
+    with HistoryReader(path) as reader:
+        assert reader.physical_deck is True
+        for game_index, record in enumerate(reader):
+            replay = Replay.from_file(path, game_index)
+            assert replay.game.physical_deck
+            while replay.step():
+                pass
+            assert bytes(replay.game.history.records) == bytes(record.history.records)
+
+
+def test_replay_matches_final_state():
+    game_seed = tournament.derive_game_seed(3, 0)
+    game = tournament.play_game(tournament.setup_game(LINEUP, game_seed))
+
+    names = [player.name for player in game.players]
+    replay = Replay(names, game_seed, game.history.get_target_seats())
+    replayed_game = replay.seek(game.turns)
+    for player, replayed_player in zip(game.players, replayed_game.players):
+        assert replayed_player.get_self_tank_colours() == player.get_self_tank_colours()
+        assert len(replayed_player.score_pile) == len(player.score_pile)
+    assert replayed_game.game_over_message() == game.game_over_message()
+
+
+def test_seek_backwards():
+    game_seed = tournament.derive_game_seed(4, 0)
+    game = tournament.play_game(tournament.setup_game(LINEUP, game_seed))
+    names = [player.name for player in game.players]
+    replay = Replay(names, game_seed, game.history.get_target_seats())
+
+    replay.seek(5)
+    tanks_at_turn_5 = [player.get_self_tank_colours() for player in replay.game.players]
+    replay.seek(game.turns)
+    replay.seek(5)
+    assert replay.game.turns == 5
+    assert len(replay.game.history) == 5
+    assert [player.get_self_tank_colours() for player in replay.game.players] == tanks_at_turn_5
+
+
+def test_print_info(capsys):
+    game_seed = tournament.derive_game_seed(6, 0)
+    game = tournament.play_game(tournament.setup_game(LINEUP, game_seed))
+    replay = Replay([player.name for player in game.players], game_seed, game.history.get_target_seats())
+    replay.seek(3)
+    replay.print_info()
+    assert capsys.readouterr().out.startswith(f"Turn 3: {game.get_last_history_text(3)}")
+
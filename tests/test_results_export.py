@@ -0,0 +1,74 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import brains
+import results_export
+import tournament
+
+LINEUP = [brains.ScorerBrain, brains.QuantityBrain, brains.KleptoBrain]
+
+
+def test_export_matches_tournament(tmp_path):
+    results = tournament.run_tournament(LINEUP, n_games=30, seed=2, results_dir=tmp_path)
+    games = results_export.load_games(tmp_path)
+    turns = results_export.load_turns(tmp_path)
+
+    assert list(games["game_index"]) == list(range(30))
+    assert games["seed"][3] == tournament.derive_game_seed(2, 3)
+    assert int(games["turns"].sum()) == results.total_turns == len(turns["game_index"])
+    for seat in range(len(LINEUP)):
+        assert int((games["winner_seat"] == seat).sum()) == results.wins[seat]
+        assert int(games[f"score_{seat}"].sum()) == results.total_scores[seat]
+        assert int(games[f"tank_size_{seat}"].sum()) == results.total_tank_sizes[seat]
+    assert int(games["goal_reached"].sum()) == results.goal_reached
+
+    assert turns["turn"][0] == 0
+    assert int(turns["turn"].max()) == results.max_turns - 1
+    assert (turns["active_seat"] == turns["turn"] % len(LINEUP)).all()
+    assert ((turns["colour_index"] >= 1) & (turns["colour_index"] <= 7)).all()
+    assert (turns["cards_moved"][~turns["success"]] == 1).all()
+
+    assert results_export.load_lineup(tmp_path) == (
+        ["ScorerBrain", "QuantityBrain", "KleptoBrain"],
+        ["Scorer", "Quantity", "Klepto"],
+    )
+
+
+def test_batches(tmp_path):
+    game = tournament.play_game(tournament.setup_game(LINEUP, game_seed=1))
+    writer = results_export.ResultsWriter(tmp_path, LINEUP, ["Scorer", "Quantity", "Klepto"], batch_size=2)
+    with writer:
+        for game_index in range(5):
+            writer.record_game(game, game_index)
+    assert writer.shards_written == 3
+    games = results_export.load_games(tmp_path)
+    assert list(games["game_index"]) == [0, 1, 2, 3, 4]
+    turns = results_export.load_turns(tmp_path)
+    assert len(turns["turn"]) == 5 * game.turns
+    assert list(turns["turn"][: game.turns]) == list(range(game.turns))
+
+
+def test_parallel_export(tmp_path):
+    tournament.run_tournament(LINEUP, n_games=20, seed=4, results_dir=tmp_path / "serial")
+    tournament.run_tournament(LINEUP, n_games=20, seed=4, workers=2, results_dir=tmp_path / "parallel")
+    serial = results_export.load_games(tmp_path / "serial")
+    parallel = results_export.load_games(tmp_path / "parallel")
+    for name in serial:
+        assert (serial[name] == parallel[name]).all()
+
+
+def test_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    game = tournament.play_game(tournament.setup_game(LINEUP, game_seed=1))
+    with results_export.ResultsWriter(tmp_path, LINEUP, ["Scorer", "Quantity", "Klepto"], file_format="parquet") as writer:
+        writer.record_game(game, 0)
+    assert results_export.load_games(tmp_path)["turns"][0] == game.turns
+    assert results_export.load_lineup(tmp_path)[1] == ["Scorer", "Quantity", "Klepto"]
+
+
+def test_refuses_used_directory(tmp_path):
+    tournament.run_tournament(LINEUP, n_games=4, seed=1, results_dir=tmp_path)
+    with pytest.raises(FileExistsError):
+        tournament.run_tournament(LINEUP, n_games=2, seed=1, workers=2, results_dir=tmp_path)
+    assert list(results_export.load_games(tmp_path)["game_index"]) == [0, 1, 2, 3]
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import brains
+import neural
+import selfplay
+
+LINEUP = [brains.QuantityBrain, brains.ScorerBrain, brains.BlueShellBrain]
+
+
+def test_generate_dataset(tmp_path):
+    manifest = selfplay.generate_dataset(LINEUP, n_games=10, directory=tmp_path, seed=1, games_per_shard=4)
+    assert [shard["index"] for shard in manifest["shards"]] == [0, 1, 2]
+    assert manifest["shards"][-1]["stop"] == 10
+    with open(tmp_path / selfplay.MANIFEST_NAME) as file:
+        assert json.load(file) == manifest
+
+    shards = list(selfplay.iter_shards(tmp_path))
+    assert isinstance(shards[0]["states"], np.memmap)
+    for shard, entry in zip(shards, manifest["shards"]):
+        assert shard["states"].shape == (entry["samples"], neural.STATE_SIZE)
+        assert len(shard["targets"]) == len(shard["outcomes"]) == entry["samples"]
+
+    dataset = selfplay.load_dataset(tmp_path)
+    assert sorted(set(dataset["game_indices"])) == list(range(10))
+    assert ((dataset["targets"] >= 0) & (dataset["targets"] < len(LINEUP))).all()
+    assert set(dataset["outcomes"]) <= {-1, 0, 1}
+    # Slot 0 of every state is the active player
+    assert (dataset["states"][:, 0] == 1).all()
+
+
+def test_targets_are_turn_order_slots(tmp_path):
+    # ScorerBrain always targets itself, and KleptoBrain never does
+    selfplay.generate_dataset([brains.ScorerBrain, brains.ScorerBrain], n_games=2, directory=tmp_path / "scorer")
+    assert (selfplay.load_dataset(tmp_path / "scorer")["targets"] == 0).all()
+    selfplay.generate_dataset([brains.KleptoBrain, brains.KleptoBrain], n_games=2, directory=tmp_path / "klepto")
+    klepto = selfplay.load_dataset(tmp_path / "klepto")
+    assert (klepto["targets"] == 1).all()
+
+
+def test_resume(tmp_path):
+    complete = tmp_path / "complete"
+    resumed = tmp_path / "resumed"
+    selfplay.generate_dataset(LINEUP, n_games=9, directory=complete, seed=2, games_per_shard=3)
+
+    # An interrupted run: the first shard finished, and the second was never added to the manifest
+    selfplay.generate_dataset(LINEUP, n_games=3, directory=resumed, seed=2, games_per_shard=3)
+    first_shard_time = os.path.getmtime(selfplay.get_shard_path(resumed, 0, "states"))
+    manifest = selfplay.generate_dataset(LINEUP, n_games=9, directory=resumed, seed=2, games_per_shard=3)
+    assert len(manifest["shards"]) == 3
+    assert os.path.getmtime(selfplay.get_shard_path(resumed, 0, "states")) == first_shard_time
+
+    for name, values in selfplay.load_dataset(complete).items():
+        assert np.array_equal(values, selfplay.load_dataset(resumed)[name])
+
+    with pytest.raises(ValueError):
+        selfplay.generate_dataset(LINEUP, n_games=9, directory=resumed, seed=3, games_per_shard=3)
+
+
+def test_extend_partial_shard(tmp_path):
+    selfplay.generate_dataset(LINEUP, n_games=15, directory=tmp_path, seed=5, games_per_shard=10)
+    manifest = selfplay.generate_dataset(LINEUP, n_games=25, directory=tmp_path, seed=5, games_per_shard=10)
+    assert [(shard["start"], shard["stop"]) for shard in manifest["shards"]] == [(0, 10), (10, 20), (20, 25)]
+    assert sorted(set(selfplay.load_dataset(tmp_path)["game_indices"])) == list(range(25))
+
+    # Asking for fewer games than the dataset has doesn't shrink it
+    manifest = selfplay.generate_dataset(LINEUP, n_games=12, directory=tmp_path, seed=5, games_per_shard=10)
+    assert manifest["n_games"] == 25 and manifest["shards"][-1]["stop"] == 25
+
+
+def test_interrupted_regeneration(tmp_path, monkeypatch):
+    selfplay.generate_dataset(LINEUP, n_games=6, directory=tmp_path, seed=6, games_per_shard=4)
+
+    # The short second shard is regenerated, but the run dies after writing only its first array
+    replace = os.replace
+    replaced = []
+
+    def failing_replace(source, destination):
+        if replaced:
+            raise OSError("Interrupted")
+        replaced.append(destination)
+        replace(source, destination)
+
+    monkeypatch.setattr(selfplay.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        selfplay.generate_dataset(LINEUP, n_games=8, directory=tmp_path, seed=6, games_per_shard=4)
+    monkeypatch.undo()
+
+    assert [shard["index"] for shard in selfplay.load_manifest(tmp_path)["shards"]] == [0]
+    dataset = selfplay.load_dataset(tmp_path)
+    assert len(set(len(values) for values in dataset.values())) == 1
+    assert sorted(set(dataset["game_indices"])) == [0, 1, 2, 3]
+
+    manifest = selfplay.generate_dataset(LINEUP, n_games=8, directory=tmp_path, seed=6, games_per_shard=4)
+    assert [(shard["start"], shard["stop"]) for shard in manifest["shards"]] == [(0, 4), (4, 8)]
+    assert sorted(set(selfplay.load_dataset(tmp_path)["game_indices"])) == list(range(8))
+
+
+def test_parallel_generation(tmp_path):
+    serial = selfplay.generate_dataset(LINEUP, n_games=8, directory=tmp_path / "serial", seed=4, games_per_shard=2)
+    parallel = selfplay.generate_dataset(
+        LINEUP, n_games=8, directory=tmp_path / "parallel", seed=4, games_per_shard=2, workers=2
+    )
+    assert serial == parallel
+    for name, values in selfplay.load_dataset(tmp_path / "serial").items():
+        assert np.array_equal(values, selfplay.load_dataset(tmp_path / "parallel")[name])
@@ -0,0 +1,93 @@
+import random
+
+import brains
+import mantis_logic
+import tournament
+
+
+def test_get_player_name():
+    game = mantis_logic.Mantis()
+    assert tournament.get_player_name(game, brains.QuantityBrain) == "Quantity"
+    game.Player(game, brains.QuantityBrain, "Quantity")
+    assert tournament.get_player_name(game, brains.QuantityBrain) == "Quantity2"
+
+
+def test_run_tournament():
+    lineup = [brains.ScorerBrain, brains.QuantityBrain, brains.QuantityBrain]
+    results = tournament.run_tournament(lineup, n_games=50, seed=1)
+    assert results.player_names == ["Scorer", "Quantity", "Quantity2"]
+    assert results.games == 50
+    assert sum(results.wins) + results.draws == 50
+    assert results.min_turns <= results.average_turns() <= results.max_turns
+    for seat in range(3):
+        assert 0 <= results.win_rate(seat) <= 1
+
+
+def test_run_tournament_is_seeded():
+    lineup = [brains.RandomBrain, brains.BlueShellBrain, brains.KleptoBrain]
+    first = tournament.run_tournament(lineup, n_games=20, seed=7)
+    second = tournament.run_tournament(lineup, n_games=20, seed=7)
+    assert first.as_dict() == second.as_dict()
+
+
+def test_seeded_games_are_independent():
+    # Games set up together (as batched play and the environment do) don't share their Brains' randomness,
+    # and the caller's random module state is left alone
+    lineup = [brains.RandomBrain, brains.RandomBrain]
+    alone = tournament.play_game(tournament.setup_game(lineup, game_seed=2))
+    random.seed(0)
+    state = random.getstate()
+    first = tournament.setup_game(lineup, game_seed=1)
+    second = tournament.setup_game(lineup, game_seed=2)
+    assert random.getstate() == state
+    tournament.play_game(second)
+    tournament.play_game(first)
+    assert bytes(second.history.records) == bytes(alone.history.records)
+
+
+def test_run_tournament_prints_nothing(capsys):
+    tournament.run_tournament([brains.ScorerBrain, brains.KleptoBrain], n_games=5, seed=0)
+    assert capsys.readouterr().out == ""
+
+
+def test_all_klepto_games_run_out_of_cards():
+    lineup = [brains.KleptoBrain, brains.KleptoBrain, brains.KleptoBrain, brains.KleptoBrain]
+    results = tournament.run_tournament(lineup, n_games=5, seed=3)
+    assert results.goal_reached == 0
+    assert results.min_turns == results.max_turns == 89
+
+
+def test_split_games():
+    assert tournament.split_games(10, 3) == [(0, 3), (3, 6), (6, 10)]
+    assert tournament.split_games(2, 8) == [(0, 1), (1, 2)]
+
+
+def test_merge_results():
+    lineup = [brains.ScorerBrain, brains.BlueShellBrain]
+    whole = tournament.play_games(lineup, seed=5, start=0, stop=20)
+    merged = tournament.play_games(lineup, seed=5, start=0, stop=8)
+    merged.merge(tournament.play_games(lineup, seed=5, start=8, stop=20))
+    assert merged.as_dict() == whole.as_dict()
+
+
+def test_parallel_matches_serial():
+    lineup = [brains.RandomBrain, brains.QuantityBrain, brains.KleptoBrain, brains.ScorerBrain]
+    serial = tournament.run_tournament(lineup, n_games=40, seed=11, workers=1)
+    parallel = tournament.run_tournament(lineup, n_games=40, seed=11, workers=3)
+    assert parallel.as_dict() == serial.as_dict()
+
+
+def test_physical_deck_tournament():
+    lineup = [brains.ScorerBrain, brains.QuantityBrain]
+    results = tournament.run_tournament(lineup, n_games=20, seed=2, physical_deck=True)
+    assert results.games == 20
+
+
+def test_setup_game_with_deck():
+    lineup = [brains.ScorerBrain, brains.QuantityBrain]
+    deck = tournament.make_deck(5)
+    seeded = tournament.setup_game(lineup, game_seed=5)
+    dealt = tournament.setup_game(lineup, game_seed=5, deck=deck)
+    assert dealt.deck == seeded.deck
+    assert [player.tank for player in dealt.players] == [player.tank for player in seeded.players]
+    assert len(deck) == mantis_logic.DECK_SIZE  # The shared deck isn't drawn from
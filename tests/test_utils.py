@@ -1,3 +1,5 @@
+import pytest
+
 import utils
 
 def test_convert_colour_index_to_name():
@@ -38,3 +40,153 @@ def test_validate_colour():
     assert utils.validate_colour("pink") is True
 
     assert utils.validate_colour("1") is False
+
+
+class Card:
+    def __init__(self, colour):
+        self.colour = colour
+        self.front = utils.COLOUR_INDICES[colour]
+
+
+def test_card_pile_keeps_order():
+    red, green, red2 = Card("red"), Card("green"), Card("red")
+    pile = utils.CardPile([red, green])
+    pile.append(red2)
+    assert len(pile) == 3
+    assert list(pile) == [red, green, red2]
+    assert pile == [red, green, red2]
+    assert pile[1] is green
+    assert pile[-1] is red2
+    assert pile.colours() == ["red", "green", "red"]
+
+
+def test_card_pile_list_methods():
+    red, green, blue, red2 = Card("red"), Card("green"), Card("blue"), Card("red")
+    pile = utils.CardPile([red, green, blue])
+    assert pile[0] is red
+    assert pile.pop() is blue
+    assert pile == [red, green]
+    pile.append(red2)
+    assert pile.count_colour("red") == 2
+    assert pile.pop(0) is red
+    assert pile.get_colour("red") == [red2]
+    pile.insert(0, blue)
+    assert pile == [blue, green, red2]
+    assert pile.index(green) == 1
+    assert pile.count(red2) == 1
+    assert red2 in pile and red not in pile
+    assert pile + [red] == [blue, green, red2, red]
+    assert [red] + pile == [red, blue, green, red2]
+    pile.sort(key=lambda card: card.front)
+    assert pile == [red2, green, blue]
+    assert pile.get_colour("blue") == [blue]
+    del pile[-1]
+    assert pile == [red2, green]
+    pile.clear()
+    assert pile == [] and pile.count_colour("red") == 0
+
+
+def test_card_pile_colours():
+    red, green, red2 = Card("red"), Card("green"), Card("red")
+    pile = utils.CardPile([red, green, red2])
+    assert pile.count_colour("red") == 2
+    assert pile.count_colour("blue") == 0
+    assert pile.get_colour("red") == [red, red2]
+    assert pile.colour_counts()["green"] == 1
+
+    assert pile.remove_colour("red") == [red, red2]
+    assert pile == [green]
+    assert pile.count_colour("red") == 0
+
+    pile.remove(green)
+    assert pile == []
+    assert not pile
+
+
+def test_move_colours_from_card_pile():
+    red, green, red2, blue = Card("red"), Card("green"), Card("red"), Card("blue")
+    source = utils.CardPile([red, green, red2])
+    target = utils.CardPile([blue])
+    assert utils.get_matching_colours_in_list(source, "red") == [red, red2]
+    assert utils.move_colours_from_list(source, "red", target) == 2
+    assert source == [green]
+    assert target == [blue, red, red2]
+
+    plain_target = []
+    assert utils.move_colours_from_list(target, "blue", plain_target) == 1
+    assert plain_target == [blue]
+
+
+def test_colour_tables():
+    for name, colour in utils.COLOUR_DICT.items():
+        index = colour["index"]
+        assert utils.COLOUR_NAMES[index] == utils.convert_colour_index_to_name(index) == name
+        assert utils.COLOUR_INDICES[name] == index
+        assert utils.COLOUR_EMOJIS[index] == utils.convert_colour_name_to_emoji(name) == colour["emoji"]
+    assert "" not in utils.COLOUR_INDICES
+    assert utils.Colour.BLUE == 5
+    assert utils.Colour.BLUE.colour_name == utils.BLUE
+    assert utils.Colour.PINK.emoji == "🩷"
+
+
+def test_convert_invalid_colour_index():
+    for colour_index in (0, 8, -1, True, "1"):
+        with pytest.raises(LookupError):
+            utils.convert_colour_index_to_name(colour_index)
+
+
+def test_get_colour_index():
+    assert utils.get_colour_index("Blue ") == 5
+    assert utils.get_colour_index(5) == 5
+    assert utils.get_colour_index(utils.Colour.PINK) == 7
+    for invalid in ("", "black", 0, 8, True, False, 1.0, None):
+        with pytest.raises(ValueError):
+            utils.get_colour_index(invalid)
+        with pytest.raises(ValueError):
+            utils.to_colour_index(invalid)
+    assert utils.validate_colour(utils.Colour.RED) is True
+    assert utils.validate_colour(0) is False
+    assert utils.validate_colour(True) is False
+
+
+def test_helpers_take_colour_indices():
+    red, green, red2 = Card("red"), Card("green"), Card("red")
+    assert utils.get_matching_colours_in_list([red, green, red2], utils.Colour.RED) == [red, red2]
+    source = [red, green, red2]
+    target = []
+    assert utils.move_colours_from_list(source, 4, target) == 1
+    assert source == [red, red2]
+    assert target == [green]
+    pile = utils.CardPile([red, green, red2])
+    assert utils.move_colours_from_list(pile, utils.Colour.RED, target) == 2
+    assert pile == [green]
+
+
+class Player:
+    def __init__(self, tank):
+        self.tank = tank
+
+
+@pytest.mark.parametrize("pile_type", [list, utils.CardPile])
+def test_helpers_validate_colours(pile_type):
+    red, green = Card("red"), Card("green")
+    player = Player(pile_type([red, green]))
+    assert utils.get_matching_colours_of_player(player, "Red") == [red]
+    for colour in ("notacolour", "", 0, 9, None):
+        with pytest.raises(ValueError):
+            utils.get_matching_colours_of_player(player, colour)
+        with pytest.raises(ValueError):
+            utils.move_colours_from_tank(player, colour, [])
+    assert player.tank == [red, green]
+
+
+def test_card_pile_validates_colours():
+    pile = utils.CardPile([Card("red")])
+    assert pile.count_colour("Red") == 1
+    assert pile.get_colour(utils.Colour.RED) == list(pile)
+    for method in (pile.count_colour, pile.get_colour, pile.remove_colour):
+        with pytest.raises(ValueError):
+            method("notacolour")
+        with pytest.raises(ValueError):
+            method(9)
+    assert len(pile) == 1
@@ -0,0 +1,47 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import brains
+import tournament
+import vectorized
+
+
+def test_unsupported_brain():
+    with pytest.raises(ValueError):
+        vectorized.simulate_games([brains.ManualBrain, brains.ScorerBrain], 10, seed=0)
+
+
+def test_seeded():
+    lineup = [brains.RandomBrain, brains.BlueShellBrain, brains.QuantityBrain]
+    first = vectorized.simulate_games(lineup, 500, seed=3)
+    second = vectorized.simulate_games(lineup, 500, seed=3)
+    assert first.as_dict() == second.as_dict()
+
+
+def test_cards_are_conserved():
+    lineup = [brains.RandomBrain, brains.KleptoBrain, brains.QuantityBrain, brains.ScorerBrain]
+    games = vectorized.VectorizedGames(lineup, 200, seed=1)
+    while games.step():
+        cards_in_play = games.tanks.sum(axis=(1, 2)) + games.scores.sum(axis=1)
+        expected = len(lineup) * vectorized.STARTING_TANK_SIZE + games.turns
+        assert (cards_in_play == expected).all()
+
+
+def test_all_klepto_games_run_out_of_cards():
+    results = vectorized.simulate_games([brains.KleptoBrain] * 4, 100, seed=2)
+    assert results.goal_reached == 0
+    assert results.min_turns == results.max_turns == 89
+
+
+def test_matches_reference_engine():
+    lineup = [brains.ScorerBrain, brains.QuantityBrain, brains.BlueShellBrain, brains.KleptoBrain]
+    reference = tournament.run_tournament(lineup, n_games=600, seed=4)
+    fast = vectorized.simulate_games(lineup, 20000, seed=4)
+    for seat in range(len(lineup)):
+        p = fast.win_rate(seat)
+        standard_error = math.sqrt(max(p * (1 - p), 0.01) / reference.games)
+        assert abs(reference.win_rate(seat) - p) < 5 * standard_error
+    assert abs(reference.average_turns() - fast.average_turns()) < 2
@@ -0,0 +1,333 @@
+"""
+Headless bot-vs-bot tournaments.
+
+Plays many games between a fixed lineup of Brains without printing anything, and aggregates the results.
+
+Every game gets its own random.Random, seeded from the master seed and the game's index, so a tournament gives
+identical results however its games are split between worker processes.
+
+Example:
+    results = run_tournament([ScorerBrain, QuantityBrain, KleptoBrain], n_games=10000, seed=1, workers=None)
+    results.win_rate(0)
+"""
+
+import hashlib
+import io
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+import mantis_logic
+from brains import get_brain_name
+from game_history import HistoryWriter
+from profiling import Profiler
+
+SHARDS_PER_WORKER = 4
+
+
+def get_player_name(game, brain) -> str:
+    """Names a player after its Brain, the same way demo.py does ("Quantity", "Quantity2", ...)."""
+    strategy_name = get_brain_name(brain).replace("Brain", "")
+    name = strategy_name
+    for i in range(2, 100):
+        if game.is_valid_new_name(name):
+            break
+        name = f"{strategy_name}{i}"
+    return name
+
+
+class TournamentResults:
+    """
+    Aggregated statistics for a batch of games played by the same lineup of Brains.
+    Every list is indexed by seat (the order the Brains were passed in).
+
+    - player_names: the name of the player in each seat.
+    - games: the number of games played.
+    - wins: the number of games won by each seat.
+    - draws: the number of games where the tie-breaking rules couldn't pick a winner.
+    - total_scores: the sum of each seat's final score pile size.
+    - total_tank_sizes: the sum of each seat's final tank size.
+    - total_turns, min_turns, max_turns: turn counts over all games.
+    - goal_reached: the number of games that ended by a player reaching the goal
+                    (the rest ended by running out of cards).
+    """
+
+    def __init__(self, player_names: list):
+        num_of_seats = len(player_names)
+        self.player_names = list(player_names)
+        self.games = 0
+        self.wins = [0] * num_of_seats
+        self.draws = 0
+        self.total_scores = [0] * num_of_seats
+        self.total_tank_sizes = [0] * num_of_seats
+        self.total_turns = 0
+        self.min_turns = None
+        self.max_turns = 0
+        self.goal_reached = 0
+        # A profiling.Profiler, if the games were profiled
+        self.profiler = None
+
+    def record_game(self, game):
+        """Adds the final state of a finished game to the totals."""
+        self.games += 1
+        for seat, player in enumerate(game.players):
+            self.total_scores[seat] += len(player.score_pile)
+            self.total_tank_sizes[seat] += len(player.tank)
+
+        winner = game.get_winner()
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[game.players.index(winner)] += 1
+
+        turns = game.turns
+        self.total_turns += turns
+        if self.min_turns is None or turns < self.min_turns:
+            self.min_turns = turns
+        if turns > self.max_turns:
+            self.max_turns = turns
+        if game.is_goal_reached():
+            self.goal_reached += 1
+
+    def merge(self, other):
+        """Adds another TournamentResults (for the same lineup) into this one."""
+        assert other.player_names == self.player_names
+        self.games += other.games
+        self.draws += other.draws
+        self.total_turns += other.total_turns
+        self.goal_reached += other.goal_reached
+        for seat in range(len(self.player_names)):
+            self.wins[seat] += other.wins[seat]
+            self.total_scores[seat] += other.total_scores[seat]
+            self.total_tank_sizes[seat] += other.total_tank_sizes[seat]
+        if other.min_turns is not None and (self.min_turns is None or other.min_turns < self.min_turns):
+            self.min_turns = other.min_turns
+        if other.max_turns > self.max_turns:
+            self.max_turns = other.max_turns
+        if other.profiler is not None:
+            if self.profiler is None:
+                self.profiler = Profiler()
+            self.profiler.merge(other.profiler)
+        return self
+
+    def win_rate(self, seat: int) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.wins[seat] / self.games
+
+    def average_score(self, seat: int) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.total_scores[seat] / self.games
+
+    def average_turns(self) -> float:
+        if self.games == 0:
+            return 0.0
+        return self.total_turns / self.games
+
+    def as_dict(self) -> dict:
+        return {
+            "player_names": self.player_names,
+            "games": self.games,
+            "wins": self.wins,
+            "draws": self.draws,
+            "total_scores": self.total_scores,
+            "total_tank_sizes": self.total_tank_sizes,
+            "total_turns": self.total_turns,
+            "min_turns": self.min_turns,
+            "max_turns": self.max_turns,
+            "goal_reached": self.goal_reached,
+        }
+
+
+def add_players(game, brains: list):
+    """Seats one player per Brain, in order."""
+    for brain in brains:
+        game.Player(game, brain, get_player_name(game, brain))
+    return game
+
+
+def derive_game_seed(seed: int, game_index: int) -> int:
+    """Returns the seed for one game of a tournament. Doesn't depend on which process plays the game."""
+    digest = hashlib.sha256(f"{seed}:{game_index}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def make_game_rng(game_seed: int) -> tuple:
+    """Returns the rng for the game with the given seed, and the seed for its Brains' randomness.
+    replay.py relies on this to rebuild a tournament game's deck from its seed."""
+    rng = random.Random(game_seed)
+    brain_seed = rng.getrandbits(64)
+    return rng, brain_seed
+
+
+def make_deck(game_seed: int, physical_deck=False) -> list:
+    """Returns the deck that setup_game() deals for a game_seed, for playing the same cards in several games."""
+    rng, _ = make_game_rng(game_seed)
+    game = mantis_logic.Mantis(rng)
+    game.physical_deck = physical_deck
+    game.shuffle_deck()
+    return game.deck
+
+
+def setup_game(brains: list, game_seed=None, physical_deck=False, deck=None):
+    """Creates a Mantis game with one player per Brain and deals the cards.
+    If game_seed is given, the game gets its own seeded random.Random, and so do its Brains (see Info.rng).
+    If deck is given (see make_deck()), it's dealt instead of a new deck."""
+    rng = None
+    if game_seed is not None:
+        rng, brain_seed = make_game_rng(game_seed)
+    game = add_players(mantis_logic.Mantis(rng), brains)
+    if game_seed is not None:
+        game.brain_rng = random.Random(brain_seed)
+    game.physical_deck = physical_deck
+    game.start_game(deck)
+    return game
+
+
+def play_game(game):
+    """Plays a started game to the end without printing anything."""
+    while not game.is_game_over():
+        game.simulate_turn(return_result=False)
+    return game
+
+
+def get_player_names(brains: list) -> list:
+    """Returns the names add_players() would give the Brains' players, without instantiating the Brains."""
+    game = mantis_logic.Mantis()
+    for brain in brains:
+        game.Player(game, None, get_player_name(game, brain))
+    return [player.name for player in game.players]
+
+
+def play_games(
+    brains: list,
+    seed: int,
+    start: int,
+    stop: int,
+    physical_deck=False,
+    history_writer=None,
+    results_dir=None,
+    profile=False,
+) -> TournamentResults:
+    """Plays games start..stop-1 of a tournament. This is the unit of work for each worker process.
+    If a HistoryWriter is given, every game's history is streamed into it.
+    If results_dir is given, per-game and per-turn results are exported there (see results_export.py).
+    If profile is True, every turn is timed into results.profiler (see profiling.py).
+    Each seat's Brain is instantiated once and reused for every game, so Brains can keep state between games.
+    (Brains that do make their results depend on how the games are split between workers.)"""
+    seat_brains = [brain() if isinstance(brain, type) else brain for brain in brains]
+    player_names = get_player_names(brains)
+    results = TournamentResults(player_names)
+    if profile:
+        results.profiler = Profiler()
+    results_writer = None
+    if results_dir is not None:
+        from results_export import ResultsWriter  # Needs NumPy, so it's only imported when used
+
+        results_writer = ResultsWriter(results_dir, brains, player_names, name=f"{start:012d}")
+    for game_index in range(start, stop):
+        game_seed = derive_game_seed(seed, game_index)
+        if profile:
+            setup_start = perf_counter()
+            game = setup_game(seat_brains, game_seed, physical_deck)
+            results.profiler.add("setup", perf_counter() - setup_start)
+            game.profiler = results.profiler
+        else:
+            game = setup_game(seat_brains, game_seed, physical_deck)
+        results.record_game(play_game(game))
+        if history_writer is not None:
+            history_writer.write_game(game, game_seed)
+        if results_writer is not None:
+            results_writer.record_game(game, game_index, game_seed)
+    if results_writer is not None:
+        results_writer.close()
+    return results
+
+
+def play_games_with_history(
+    brains: list, seed: int, start: int, stop: int, physical_deck=False, results_dir=None, profile=False
+) -> tuple:
+    """Like play_games(), but also returns the games' history records as bytes, for a worker process to send back."""
+    buffer = io.BytesIO()
+    history_writer = HistoryWriter(
+        buffer, get_player_names(brains), physical_deck, mantis_logic.DEFAULT_GOAL, write_header=False
+    )
+    results = play_games(brains, seed, start, stop, physical_deck, history_writer, results_dir, profile)
+    return results, buffer.getvalue()
+
+
+def split_games(n_games: int, num_of_shards: int) -> list:
+    """Splits range(n_games) into contiguous (start, stop) shards."""
+    num_of_shards = max(1, min(n_games, num_of_shards))
+    shards = []
+    for shard in range(num_of_shards):
+        start = n_games * shard // num_of_shards
+        stop = n_games * (shard + 1) // num_of_shards
+        shards.append((start, stop))
+    return shards
+
+
+def run_tournament(
+    brains: list,
+    n_games: int,
+    seed=None,
+    workers=1,
+    physical_deck=False,
+    history_path=None,
+    results_dir=None,
+    profile=False,
+) -> TournamentResults:
+    """Plays n_games headless games between the given Brains (one seat per Brain, in order)
+    and returns the aggregated TournamentResults.
+
+    workers is the number of processes to shard the games across (None uses every core).
+    For a given seed, the results are the same for any number of workers.
+    physical_deck plays every game with the shuffled 105-card physical deck (see Mantis.physical_deck).
+    history_path streams every game's history, in order, into a binary history file (see game_history.py).
+    results_dir exports per-game and per-turn results as columnar shards (see results_export.py).
+    It must not hold shards from an earlier run, since they would be loaded together.
+    profile times every turn by phase and every Brain's decisions into results.profiler (see profiling.py)."""
+    if seed is None:
+        seed = random.getrandbits(64)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if results_dir is not None:
+        from results_export import check_unused
+
+        check_unused(results_dir)
+
+    if history_path is None:
+        return run_games(brains, n_games, seed, workers, physical_deck, None, results_dir, profile)
+    with open(history_path, "wb") as file:
+        history_writer = HistoryWriter(file, get_player_names(brains), physical_deck, mantis_logic.DEFAULT_GOAL)
+        return run_games(brains, n_games, seed, workers, physical_deck, history_writer, results_dir, profile)
+
+
+def run_games(
+    brains: list, n_games: int, seed: int, workers: int, physical_deck: bool, history_writer, results_dir, profile
+) -> TournamentResults:
+    if workers <= 1 or n_games <= 1:
+        return play_games(brains, seed, 0, n_games, physical_deck, history_writer, results_dir, profile)
+
+    results = TournamentResults(get_player_names(brains))
+    shards = split_games(n_games, workers * SHARDS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if history_writer is None:
+            futures = [
+                executor.submit(play_games, brains, seed, start, stop, physical_deck, None, results_dir, profile)
+                for start, stop in shards
+            ]
+            for future in futures:
+                results.merge(future.result())
+        else:
+            futures = [
+                executor.submit(play_games_with_history, brains, seed, start, stop, physical_deck, results_dir, profile)
+                for start, stop in shards
+            ]
+            for future in futures:
+                shard_results, history_data = future.result()
+                results.merge(shard_results)
+                history_writer.write_raw(history_data, shard_results.games)
+    return results
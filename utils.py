@@ -1,15 +1,56 @@
+from enum import IntEnum
+from numbers import Integral
+
+# Colour names, as constants. Every colour name the engine hands out (like Card.colour) is one of these objects.
+RED = "red"
+ORANGE = "orange"
+YELLOW = "yellow"
+GREEN = "green"
+BLUE = "blue"
+PURPLE = "purple"
+PINK = "pink"
+
 # I chose hearts for the emojis because hearts are the only emoji that have versions in all seven Mantis colours.
 # The alternative would be using colorama or ANSI escape sequences to colour a block ('█').
 COLOUR_DICT = {
-    "red": {"index": 1, "name": "red", "emoji": "❤️"},
-    "orange": {"index": 2, "name": "orange", "emoji": "🧡"},
-    "yellow": {"index": 3, "name": "yellow", "emoji": "💛"},
-    "green": {"index": 4, "name": "green", "emoji": "💚"},
-    "blue": {"index": 5, "name": "blue", "emoji": "💙"},
-    "purple": {"index": 6, "name": "purple", "emoji": "💜"},
-    "pink": {"index": 7, "name": "pink", "emoji": "🩷"},
+    RED: {"index": 1, "name": RED, "emoji": "❤️"},
+    ORANGE: {"index": 2, "name": ORANGE, "emoji": "🧡"},
+    YELLOW: {"index": 3, "name": YELLOW, "emoji": "💛"},
+    GREEN: {"index": 4, "name": GREEN, "emoji": "💚"},
+    BLUE: {"index": 5, "name": BLUE, "emoji": "💙"},
+    PURPLE: {"index": 6, "name": PURPLE, "emoji": "💜"},
+    PINK: {"index": 7, "name": PINK, "emoji": "🩷"},
 }
 
+# Lookup tables from colour indices to names and emojis, and from names back to indices.
+# Cards store their colours as indices. Index 0 is the blank colour of a card that hasn't been generated yet.
+_COLOURS_BY_INDEX = sorted(COLOUR_DICT.values(), key=lambda colour: colour["index"])
+COLOUR_NAMES = ("",) + tuple(colour["name"] for colour in _COLOURS_BY_INDEX)
+COLOUR_EMOJIS = ("",) + tuple(colour["emoji"] for colour in _COLOURS_BY_INDEX)
+COLOUR_INDICES = {name: index for index, name in enumerate(COLOUR_NAMES) if index}
+NUM_OF_COLOUR_INDICES = len(COLOUR_NAMES)
+
+
+class Colour(IntEnum):
+    """The colours by index. A Colour works anywhere a colour index does, for code that prefers an enum to names."""
+
+    RED = 1
+    ORANGE = 2
+    YELLOW = 3
+    GREEN = 4
+    BLUE = 5
+    PURPLE = 6
+    PINK = 7
+
+    @property
+    def colour_name(self) -> str:
+        return COLOUR_NAMES[self]
+
+    @property
+    def emoji(self) -> str:
+        return COLOUR_EMOJIS[self]
+
+
 DISALLOWED_NAMES = [
     "score",
     "steal",
@@ -17,18 +58,267 @@ DISALLOWED_NAMES = [
     "mantis"
 ]
 
+
+class CardPile:
+    """
+    A list-like pile of cards (a tank or a score pile) that keeps its cards bucketed by colour.
+
+    Counting, finding and removing all the cards of one colour only touches that colour's bucket,
+    instead of scanning (and list.remove()-ing from) the whole pile.
+    Iterating, indexing and comparing against a list still see the cards in the order they were added, and the
+    other list methods work too. Reading or popping the newest card is O(1). Other indexing is O(n), and the methods
+    that reorder cards (insert(), sort(), reverse(), item assignment) rebuild the pile.
+
+    on_change, if set, is called after cards are added to or removed from the pile, with whether the pile grew.
+    Mantis uses it to keep its score leader up to date. The undo helpers (take_colour_index(),
+    restore_colour_index() and pop_newest()) don't call it: their callers restore any state themselves.
+    """
+
+    def __init__(self, cards=()):
+        self.on_change = None
+        self._cards = {}  # position -> card, in the order they were added
+        self._buckets = [[] for _ in COLOUR_NAMES]  # colour index -> positions
+        self._next_position = 0
+        self._in_order = True  # False after restore_colour_index(), until the cards are next read in order
+        self.extend(cards)
+
+    def _ordered_cards(self) -> dict:
+        if not self._in_order:
+            self._cards = dict(sorted(self._cards.items()))
+            self._in_order = True
+        return self._cards
+
+    def append(self, card):
+        position = self._next_position
+        self._next_position += 1
+        self._cards[position] = card
+        self._buckets[card.front].append(position)
+        if self.on_change is not None:
+            self.on_change(True)
+
+    def extend(self, cards):
+        position = self._next_position
+        pile_cards = self._cards
+        buckets = self._buckets
+        for card in cards:
+            pile_cards[position] = card
+            buckets[card.front].append(position)
+            position += 1
+        if position != self._next_position:
+            self._next_position = position
+            if self.on_change is not None:
+                self.on_change(True)
+
+    def remove(self, card):
+        bucket = self._buckets[card.front]
+        for i, position in enumerate(bucket):
+            if self._cards[position] is card:
+                del bucket[i]
+                del self._cards[position]
+                if self.on_change is not None:
+                    self.on_change(False)
+                return
+        raise ValueError("CardPile.remove(card): card not in pile")
+
+    def copy(self):
+        """Returns a copy of the pile, without its on_change."""
+        pile = CardPile.__new__(CardPile)
+        pile.on_change = None
+        pile._cards = self._cards.copy()
+        pile._buckets = [bucket.copy() for bucket in self._buckets]
+        pile._next_position = self._next_position
+        pile._in_order = self._in_order
+        return pile
+
+    def take_colour_index(self, colour_index: int) -> tuple:
+        """Removes all cards of the given colour index. Returns their positions and the cards,
+        which restore_colour_index() can put back exactly where they were."""
+        positions = self._buckets[colour_index]
+        self._buckets[colour_index] = []
+        cards = self._cards
+        return positions, [cards.pop(position) for position in positions]
+
+    def restore_colour_index(self, colour_index: int, positions: list, cards: list):
+        """Undoes take_colour_index()."""
+        self._buckets[colour_index] = positions
+        for position, card in zip(positions, cards):
+            self._cards[position] = card
+        if positions:
+            self._in_order = False
+
+    def pop_newest(self, colour_index: int, count: int, next_position: int):
+        """Undoes appending count cards of the given colour index, which must be the last cards appended.
+        next_position is the pile's next_position from before they were appended."""
+        bucket = self._buckets[colour_index]
+        for _ in range(count):
+            del self._cards[bucket.pop()]
+        self._next_position = next_position
+
+    @property
+    def next_position(self) -> int:
+        return self._next_position
+
+    def count_colour_index(self, colour_index: int) -> int:
+        """Returns the number of cards of the given colour index."""
+        return len(self._buckets[colour_index])
+
+    def get_colour_index(self, colour_index: int) -> list:
+        """Returns a list of the cards of the given colour index."""
+        cards = self._cards
+        return [cards[position] for position in self._buckets[colour_index]]
+
+    def remove_colour_index(self, colour_index: int) -> list:
+        """Removes all cards of the given colour index and returns them."""
+        bucket = self._buckets[colour_index]
+        self._buckets[colour_index] = []
+        cards = self._cards
+        removed = [cards.pop(position) for position in bucket]
+        if removed and self.on_change is not None:
+            self.on_change(False)
+        return removed
+
+    def count_colour(self, colour) -> int:
+        """Returns the number of cards of the given colour (a name or index). Raises a ValueError if it isn't one."""
+        return self.count_colour_index(to_colour_index(colour))
+
+    def get_colour(self, colour) -> list:
+        """Returns a list of the cards of the given colour (a name or index). Raises a ValueError if it isn't one."""
+        return self.get_colour_index(to_colour_index(colour))
+
+    def remove_colour(self, colour) -> list:
+        """Removes all cards of the given colour (a name or index) and returns them.
+        Raises a ValueError if it isn't one."""
+        return self.remove_colour_index(to_colour_index(colour))
+
+    def colours(self) -> list:
+        """Returns a list of the colour of each card."""
+        return [COLOUR_NAMES[card.front] for card in self._ordered_cards().values()]
+
+    def colour_counts(self) -> dict:
+        """Returns a dict of the number of cards of each colour."""
+        buckets = self._buckets
+        return {COLOUR_NAMES[index]: len(buckets[index]) for index in range(1, len(COLOUR_NAMES))}
+
+    def _replace_cards(self, cards: list):
+        """Replaces the whole pile with the given cards, in order. O(n), for the list methods that reorder cards."""
+        self._cards = {}
+        self._buckets = [[] for _ in COLOUR_NAMES]
+        self._next_position = 0
+        self._in_order = True
+        on_change = self.on_change
+        self.on_change = None
+        self.extend(cards)
+        self.on_change = on_change
+        if on_change is not None:
+            on_change(False)  # The pile may have grown or shrunk, so whoever is listening has to recheck it
+
+    def pop(self, index=-1):
+        """Removes and returns the card at index, like list.pop(). Popping the newest card (the default) is O(1)."""
+        cards = self._ordered_cards()
+        if not cards:
+            raise IndexError("pop from empty CardPile")
+        if index == -1 or index == len(cards) - 1:
+            card = cards.pop(next(reversed(cards)))
+            self._buckets[card.front].pop()  # Buckets are in position order, so the newest card's is last
+            if self.on_change is not None:
+                self.on_change(False)
+            return card
+        card = self[index]
+        self.remove(card)
+        return card
+
+    def insert(self, index: int, card):
+        cards = list(self)
+        cards.insert(index, card)
+        self._replace_cards(cards)
+
+    def clear(self):
+        self._replace_cards([])
+
+    def index(self, card, *args) -> int:
+        return list(self).index(card, *args)
+
+    def count(self, card) -> int:
+        return list(self).count(card)
+
+    def sort(self, *, key=None, reverse=False):
+        self._replace_cards(sorted(self, key=key, reverse=reverse))
+
+    def reverse(self):
+        self._replace_cards(list(reversed(self)))
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __iter__(self):
+        return iter(self._ordered_cards().values())
+
+    def __reversed__(self):
+        return reversed(self._ordered_cards().values())
+
+    def __contains__(self, card):
+        return any(pile_card == card for pile_card in self.get_colour_index(card.front))
+
+    def __getitem__(self, index):
+        cards = self._ordered_cards()
+        # The oldest and newest cards are found without building a list, since they're the common lookups
+        if index == -1 and cards:
+            return cards[next(reversed(cards))]
+        if index == 0 and cards:
+            return cards[next(iter(cards))]
+        return list(cards.values())[index]
+
+    def __delitem__(self, index):
+        if isinstance(index, slice):
+            cards = list(self)
+            del cards[index]
+            self._replace_cards(cards)
+        else:
+            self.pop(index)
+
+    def __setitem__(self, index, value):
+        cards = list(self)
+        cards[index] = value
+        self._replace_cards(cards)
+
+    def __add__(self, other):
+        if isinstance(other, (CardPile, list)):
+            return list(self) + list(other)
+        return NotImplemented
+
+    def __radd__(self, other):
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+
+    def __iadd__(self, other):
+        self.extend(other)
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, (CardPile, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CardPile({list(self)!r})"
+
+
+def is_colour_index(colour) -> bool:
+    """Checks for a colour index: an int (or Colour) from 1 to 7. A bool is an int, but it's not a colour."""
+    if colour.__class__ is not int and (colour.__class__ is bool or not isinstance(colour, Integral)):
+        return False
+    return 0 < colour < NUM_OF_COLOUR_INDICES
+
+
 def convert_colour_index_to_name(colour_index: int) -> str:
-    for colour in COLOUR_DICT.values():
-        if colour["index"] == colour_index:
-            return colour["name"]
-    raise LookupError(f"Invalid colour_index: '{colour_index}'")
+    if not is_colour_index(colour_index):
+        raise LookupError(f"Invalid colour_index: '{colour_index}'")
+    return COLOUR_NAMES[colour_index]
 
 
 def convert_colour_list_to_names(colour_index_list: list) -> list:
-    colour_name_list = []
-    for colour_index in colour_index_list:
-        colour_name_list.append(convert_colour_index_to_name(colour_index))
-    return colour_name_list
+    return [convert_colour_index_to_name(colour_index) for colour_index in colour_index_list]
 
 
 def convert_colour_name_to_emoji(colour_name: str) -> str:
@@ -36,56 +326,78 @@ def convert_colour_name_to_emoji(colour_name: str) -> str:
 
 
 def convert_colour_list_to_emojis(colour_name_list: list) -> list:
-    colour_emoji_list = []
-    for colour_name in colour_name_list:
-        colour_emoji_list.append(convert_colour_name_to_emoji(colour_name))
-    return colour_emoji_list
+    return [COLOUR_DICT[colour_name]["emoji"] for colour_name in colour_name_list]
 
 
 def validate_colour(colour: str = "") -> bool:
-    return colour.lower() in COLOUR_DICT
+    """Checks a colour name (in any case) or index."""
+    if isinstance(colour, str):
+        return colour.lower() in COLOUR_DICT
+    return is_colour_index(colour)
+
+
+def get_colour_index(colour) -> int:
+    """
+    Converts a colour name (in any case), index or Colour into its index, and raises a ValueError if it isn't a colour.
+    The helpers below and CardPile's colour methods validate their colours with it. The engine's hot paths pass
+    plain int indices, which to_colour_index() checks with one lookup.
+    """
+    if isinstance(colour, str):
+        colour_index = COLOUR_INDICES.get(colour.strip().lower(), 0)
+    else:
+        colour_index = colour if is_colour_index(colour) else 0
+    if not colour_index:
+        raise ValueError(f"Invalid colour: '{colour}'")
+    return int(colour_index)
+
+
+def to_colour_index(colour) -> int:
+    """get_colour_index(), with a fast path for valid int indices."""
+    if colour.__class__ is int and 0 < colour < NUM_OF_COLOUR_INDICES:
+        return colour
+    return get_colour_index(colour)
 
 
 def get_tank_colours(player) -> list:
     """Returns a list of the colours in this player's tank."""
-    tank_colours = []
-    for card in player.tank:
-        tank_colours.append(card.colour)
-    return tank_colours
+    if isinstance(player.tank, CardPile):
+        return player.tank.colours()
+    return [card.colour for card in player.tank]
 
 
-def get_matching_colours_in_list(input_list: list, colour: str) -> list:
-    """Returns a list of the cards in this player's tank that match the given colour."""
-    assert validate_colour(colour)
-    matching_cards = []
-    for card in input_list:
-        if colour == card.colour:
-            matching_cards.append(card)
-    return matching_cards
+def get_matching_colours_in_list(input_list: list, colour) -> list:
+    """Returns a list of the cards in the list that match the given colour (a name or index).
+    Raises a ValueError if it isn't a colour."""
+    colour_index = to_colour_index(colour)
+    if isinstance(input_list, CardPile):
+        return input_list.get_colour_index(colour_index)
+    return [card for card in input_list if card.front == colour_index]
 
 
-def get_matching_colours_of_player(player, colour: str) -> list:
-    """Returns a list of the cards in this player's tank that match the given colour."""
-    assert validate_colour(colour)
+def get_matching_colours_of_player(player, colour) -> list:
+    """Returns a list of the cards in this player's tank that match the given colour (a name or index).
+    Raises a ValueError if it isn't a colour."""
     return get_matching_colours_in_list(player.tank, colour)
 
 
-def move_colours_from_list(source_list: list, colour: str, target_list: list) -> int:
-    """Moves all cards of the given colour from the source list to the target list.
-    Returns the number of cards moved."""
-    assert validate_colour(colour)
-    cards_moved = 0
-    for card in get_matching_colours_in_list(source_list, colour):
+def move_colours_from_list(source_list: list, colour, target_list: list) -> int:
+    """Moves all cards of the given colour (a name or index) from the source list to the target list.
+    Returns the number of cards moved. Raises a ValueError if it isn't a colour."""
+    colour_index = to_colour_index(colour)
+    if isinstance(source_list, CardPile):
+        matching_cards = source_list.remove_colour_index(colour_index)
+        target_list.extend(matching_cards)
+        return len(matching_cards)
+    matching_cards = get_matching_colours_in_list(source_list, colour_index)
+    for card in matching_cards:
         source_list.remove(card)
         target_list.append(card)
-        cards_moved += 1
-    return cards_moved
+    return len(matching_cards)
 
 
-def move_colours_from_tank(player, colour: str, target_list: list) -> int:
-    """Moves all cards of the given colour from the player's tank to the target list.
-    Returns the number of cards moved."""
-    assert validate_colour(colour)
+def move_colours_from_tank(player, colour, target_list: list) -> int:
+    """Moves all cards of the given colour (a name or index) from the player's tank to the target list.
+    Returns the number of cards moved. Raises a ValueError if it isn't a colour."""
     return move_colours_from_list(player.tank, colour, target_list)
 
 def list_to_spaced_string(input_list:list) -> str:
@@ -0,0 +1,159 @@
+"""
+A NumPy engine that plays thousands of games at once, for fast win-rate estimation.
+
+Instead of Card and Player objects, each game's tanks are stored as per-colour counts:
+tanks[game, seat, colour] is the number of cards of that colour in that seat's tank.
+Every game advances one turn in lockstep, so the active seat is the same in every game.
+
+Only Brains whose choice can be computed from the counts are supported (see STRATEGIES).
+Brains that break ties by the order of the shuffled Info pick uniformly among the tied players here,
+which is the same distribution. Requires NumPy.
+"""
+
+import numpy as np
+
+import brains
+from mantis_logic import DECK_SIZE, STARTING_TANK_SIZE, DEFAULT_GOAL, NUM_OF_COLOURS, MIN_PLAYERS, MAX_PLAYERS
+from tournament import TournamentResults, get_player_names
+
+SCORER = 0
+RANDOM = 1
+KLEPTO = 2
+BLUE_SHELL = 3
+QUANTITY = 4
+
+STRATEGIES = {
+    brains.ScorerBrain: SCORER,
+    brains.RandomBrain: RANDOM,
+    brains.KleptoBrain: KLEPTO,
+    brains.BlueShellBrain: BLUE_SHELL,
+    brains.QuantityBrain: QUANTITY,
+}
+
+
+def get_strategy(brain) -> int:
+    try:
+        return STRATEGIES[brain if isinstance(brain, type) else type(brain)]
+    except KeyError:
+        raise ValueError(f"Brain not supported by the vectorized engine: '{brains.get_brain_name(brain)}'") from None
+
+
+def argmax_random_ties(values, rng):
+    """Returns the index of the largest value in each row, picking uniformly among ties.
+    values must be integers, so adding noise in [0, 1) can't change the order of unequal values."""
+    return np.argmax(values + rng.random(values.shape), axis=1)
+
+
+def choose_targets(strategy: int, active: int, tanks, scores, rng):
+    """Returns each game's target seat for the active seat's Brain."""
+    num_of_games, num_of_players = scores.shape
+    if strategy == SCORER:
+        return np.full(num_of_games, active)
+    if strategy == RANDOM:
+        return rng.integers(0, num_of_players, num_of_games)
+    if strategy == KLEPTO:
+        others = rng.integers(0, num_of_players - 1, num_of_games)
+        return others + (others >= active)
+    if strategy == BLUE_SHELL:
+        return argmax_random_ties(scores, rng)
+    if strategy == QUANTITY:
+        return argmax_random_ties(tanks.sum(axis=2), rng)
+    raise ValueError(f"Invalid strategy: '{strategy}'")
+
+
+class VectorizedGames:
+    """
+    A batch of games between the same lineup of Brains, stored as arrays.
+
+    - fronts: (games, DECK_SIZE) colour index (0-6) of every card, drawn in order.
+    - tanks: (games, players, colours) card counts.
+    - scores: (games, players) score pile sizes.
+    - turns: (games,) number of turns played.
+    - alive: (games,) whether each game is still being played.
+    """
+
+    def __init__(self, input_brains: list, num_of_games: int, seed=None, goal=DEFAULT_GOAL):
+        num_of_players = len(input_brains)
+        assert MIN_PLAYERS <= num_of_players <= MAX_PLAYERS
+        self.brains = list(input_brains)
+        self.strategies = [get_strategy(brain) for brain in input_brains]
+        self.goal = goal
+        self.rng = np.random.default_rng(seed)
+        self.num_of_players = num_of_players
+
+        # Every card's front is one of the 3 colours on a uniformly random back, which makes it uniform over all 7.
+        self.fronts = self.rng.integers(0, NUM_OF_COLOURS, (num_of_games, DECK_SIZE), dtype=np.int8)
+        self.tanks = np.zeros((num_of_games, num_of_players, NUM_OF_COLOURS), dtype=np.int16)
+        self.scores = np.zeros((num_of_games, num_of_players), dtype=np.int16)
+        self.turns = np.zeros(num_of_games, dtype=np.int32)
+        self.alive = np.ones(num_of_games, dtype=bool)
+
+        games = np.arange(num_of_games)
+        for seat in range(num_of_players):
+            for i in range(STARTING_TANK_SIZE):
+                colours = self.fronts[:, seat * STARTING_TANK_SIZE + i]
+                self.tanks[games, seat, colours] += 1
+        self.cards_drawn = num_of_players * STARTING_TANK_SIZE
+        self.turn = 0
+
+    def step(self) -> bool:
+        """Plays one turn of every unfinished game. Returns False once every game is over."""
+        if self.cards_drawn >= DECK_SIZE:
+            self.alive[:] = False
+        games = np.flatnonzero(self.alive)
+        if games.size == 0:
+            return False
+
+        active = self.turn % self.num_of_players
+        colours = self.fronts[games, self.cards_drawn]
+        targets = choose_targets(
+            self.strategies[active], active, self.tanks[games], self.scores[games], self.rng
+        )
+
+        matches = self.tanks[games, targets, colours]
+        success = matches > 0
+        cards_moved = np.where(success, matches + 1, 0)
+        self.tanks[games, targets, colours] = np.where(success, 0, matches + 1)
+
+        scoring = targets == active
+        self.scores[games, active] += np.where(scoring, cards_moved, 0)
+        self.tanks[games, active, colours] += np.where(scoring, 0, cards_moved)
+
+        self.turns[games] += 1
+        self.alive[games[self.scores[games, active] >= self.goal]] = False
+        self.cards_drawn += 1
+        self.turn += 1
+        return True
+
+    def run(self):
+        while self.step():
+            pass
+        return self
+
+    def get_winners(self):
+        """Returns each game's winning seat using the tie-breaking rules (score, then tank size), or -1 for a draw."""
+        tank_sizes = self.tanks.sum(axis=2)
+        keys = self.scores.astype(np.int32) * (DECK_SIZE + 1) + tank_sizes
+        best = keys.max(axis=1, keepdims=True)
+        tied = (keys == best).sum(axis=1) > 1
+        return np.where(tied, -1, np.argmax(keys, axis=1))
+
+    def get_results(self) -> TournamentResults:
+        results = TournamentResults(get_player_names(self.brains))
+        winners = self.get_winners()
+        results.games = int(self.turns.size)
+        results.wins = [int(wins) for wins in np.bincount(winners[winners >= 0], minlength=self.num_of_players)]
+        results.draws = int((winners < 0).sum())
+        results.total_scores = [int(total) for total in self.scores.sum(axis=0)]
+        results.total_tank_sizes = [int(total) for total in self.tanks.sum(axis=(0, 2))]
+        results.total_turns = int(self.turns.sum())
+        if self.turns.size:
+            results.min_turns = int(self.turns.min())
+            results.max_turns = int(self.turns.max())
+        results.goal_reached = int((self.scores.max(axis=1) >= self.goal).sum())
+        return results
+
+
+def simulate_games(input_brains: list, n_games: int, seed=None, goal=DEFAULT_GOAL) -> TournamentResults:
+    """Vectorized equivalent of tournament.run_tournament() for the Brains in STRATEGIES."""
+    return VectorizedGames(input_brains, n_games, seed, goal).run().get_results()